@@ -19,7 +19,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.database import Base
-from app.models import Lead, User, LeadActivity
+from app.models import Lead, User, LeadActivity, LeadTombstone, LeadArchive, LeadDailyRollup
 
 # Set target metadata
 target_metadata = Base.metadata
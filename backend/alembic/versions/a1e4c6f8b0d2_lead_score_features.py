@@ -0,0 +1,81 @@
+"""Lead score features and weight version
+
+Revision ID: a1e4c6f8b0d2
+Revises: f2c5a7b9d0e1
+Create Date: 2026-10-19 20:31:12.447903
+
+Adds clarity, completeness and score_version. Existing leads get clarity and
+completeness derived the same way the rule-based scorer does (word count, and
+how many of goal/timeline/budget_range are known), in id-range chunks that each
+commit on their own. score_version stays NULL, so the next
+``python rescore_leads.py`` run re-scores every historical lead.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1e4c6f8b0d2'
+down_revision: Union[str, None] = 'f2c5a7b9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHUNK_SIZE = 20000
+
+ENUMS = {
+    'clarity': ('lead_clarity', ('clear', 'vague', 'very_vague')),
+    'completeness': ('lead_completeness', ('all', 'partial', 'minimal')),
+}
+
+WORDS = "(length(trim(initial_message)) - length(replace(trim(initial_message), ' ', '')) + 1)"
+KNOWN = (
+    "(CASE WHEN goal <> 'unclear' THEN 1 ELSE 0 END"
+    " + CASE WHEN timeline <> 'unclear' THEN 1 ELSE 0 END"
+    " + CASE WHEN budget_range <> 'not_disclosed' THEN 1 ELSE 0 END)"
+)
+CLARITY = f"CASE WHEN {WORDS} >= 15 THEN 'clear' WHEN {WORDS} >= 6 THEN 'vague' ELSE 'very_vague' END"
+COMPLETENESS = f"CASE {KNOWN} WHEN 3 THEN 'all' WHEN 0 THEN 'minimal' ELSE 'partial' END"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    postgres = conn.dialect.name == 'postgresql'
+
+    for column, (type_name, values) in ENUMS.items():
+        if postgres:
+            postgresql.ENUM(*values, name=type_name).create(conn, checkfirst=True)
+            column_type = postgresql.ENUM(*values, name=type_name, create_type=False)
+        else:
+            column_type = sa.Enum(*values, name=type_name)
+        op.add_column('leads', sa.Column(column, column_type, nullable=True))
+    op.add_column('leads', sa.Column('score_version', sa.Integer(), nullable=True))
+
+    clarity, completeness = CLARITY, COMPLETENESS
+    if postgres:
+        # A CASE over string literals is text, which needs an explicit cast to the enum
+        clarity, completeness = f"CAST({CLARITY} AS lead_clarity)", f"CAST({COMPLETENESS} AS lead_completeness)"
+
+    low, high = conn.execute(sa.text("SELECT min(id), max(id) FROM leads")).one()
+    if low is None:
+        return
+
+    with op.get_context().autocommit_block():
+        for start in range(low, high + 1, CHUNK_SIZE):
+            conn.execute(sa.text(
+                f"UPDATE leads SET clarity = {clarity}, completeness = {completeness} "
+                f"WHERE id >= :start AND id < :end"
+            ), {'start': start, 'end': start + CHUNK_SIZE})
+            print(f"   score features: backfilled up to id {min(start + CHUNK_SIZE - 1, high)}")
+
+
+def downgrade() -> None:
+    op.drop_column('leads', 'score_version')
+    op.drop_column('leads', 'completeness')
+    op.drop_column('leads', 'clarity')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for type_name, _ in ENUMS.values():
+            postgresql.ENUM(name=type_name).drop(op.get_bind(), checkfirst=True)
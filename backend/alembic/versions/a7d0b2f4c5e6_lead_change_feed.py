@@ -0,0 +1,56 @@
+"""Lead change feed
+
+Revision ID: a7d0b2f4c5e6
+Revises: f6c9a1e3b4d5
+Create Date: 2026-10-19 14:52:30.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d0b2f4c5e6'
+down_revision: Union[str, None] = 'f6c9a1e3b4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_leads_updated_at'), 'leads', ['updated_at'], unique=False)
+    op.create_table('lead_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lead_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lead_tombstones_deleted_at'), 'lead_tombstones', ['deleted_at'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE OR REPLACE FUNCTION record_lead_tombstone() RETURNS trigger AS $$ "
+            "BEGIN INSERT INTO lead_tombstones (lead_id, deleted_at) VALUES (OLD.id, now()); RETURN OLD; END "
+            "$$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            "CREATE TRIGGER leads_tombstone AFTER DELETE ON leads "
+            "FOR EACH ROW EXECUTE FUNCTION record_lead_tombstone()"
+        )
+    else:
+        op.execute(
+            "CREATE TRIGGER leads_tombstone AFTER DELETE ON leads BEGIN "
+            "INSERT INTO lead_tombstones (lead_id, deleted_at) VALUES (old.id, CURRENT_TIMESTAMP); END"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS leads_tombstone ON leads")
+        op.execute("DROP FUNCTION IF EXISTS record_lead_tombstone()")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS leads_tombstone")
+    op.drop_index(op.f('ix_lead_tombstones_deleted_at'), table_name='lead_tombstones')
+    op.drop_table('lead_tombstones')
+    op.drop_index(op.f('ix_leads_updated_at'), table_name='leads')
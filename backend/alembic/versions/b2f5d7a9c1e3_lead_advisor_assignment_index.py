@@ -0,0 +1,26 @@
+"""Lead advisor assignment index
+
+Revision ID: b2f5d7a9c1e3
+Revises: a1e4c6f8b0d2
+Create Date: 2026-10-19 21:02:47.310562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f5d7a9c1e3'
+down_revision: Union[str, None] = 'a1e4c6f8b0d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_leads_assigned_to_status', 'leads', ['assigned_to', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leads_assigned_to_status', table_name='leads')
@@ -0,0 +1,30 @@
+"""Lead admission control: requalification flag and per-IP index
+
+Revision ID: b8e1c3a5d6f7
+Revises: a7d0b2f4c5e6
+Create Date: 2026-10-19 16:05:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1c3a5d6f7'
+down_revision: Union[str, None] = 'a7d0b2f4c5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('leads', sa.Column('needs_requalification', sa.Boolean(), server_default='false', nullable=True))
+    op.create_index(op.f('ix_leads_needs_requalification'), 'leads', ['needs_requalification'], unique=False)
+    op.create_index('ix_leads_ip_address_created_at', 'leads', ['ip_address', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leads_ip_address_created_at', table_name='leads')
+    op.drop_index(op.f('ix_leads_needs_requalification'), table_name='leads')
+    op.drop_column('leads', 'needs_requalification')
@@ -0,0 +1,29 @@
+"""Lead activity timeline index
+
+Revision ID: c3f1a2d4e5b6
+Revises: b61e5977ddb1
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a2d4e5b6'
+down_revision: Union[str, None] = 'b61e5977ddb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_lead_activities_lead_id_created_at', 'lead_activities', ['lead_id', 'created_at'], unique=False)
+    # The composite index's leading column covers lookups by lead_id alone
+    op.drop_index(op.f('ix_lead_activities_lead_id'), table_name='lead_activities')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_lead_activities_lead_id'), 'lead_activities', ['lead_id'], unique=False)
+    op.drop_index('ix_lead_activities_lead_id_created_at', table_name='lead_activities')
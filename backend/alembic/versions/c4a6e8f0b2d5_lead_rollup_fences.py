@@ -0,0 +1,32 @@
+"""Lead rollup fences
+
+Revision ID: c4a6e8f0b2d5
+Revises: b2f5d7a9c1e3
+Create Date: 2026-10-19 22:14:05.682913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a6e8f0b2d5'
+down_revision: Union[str, None] = 'b2f5d7a9c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('lead_rollup_fences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day_from', sa.Date(), nullable=False),
+    sa.Column('day_to', sa.Date(), nullable=False),
+    sa.Column('fenced_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('lead_rollup_fences')
@@ -0,0 +1,146 @@
+"""Lead monthly partitions and archive catalogue
+
+Revision ID: c9f2d4b6e7a8
+Revises: b8e1c3a5d6f7
+Create Date: 2026-10-19 17:22:10.530618
+
+Postgres only: rebuilds ``leads`` as a table range-partitioned by month on
+``created_at`` (one ``leads_YYYY_MM`` partition per month plus ``leads_default``)
+and adds ``create_lead_partitions()``, which the API calls at startup to keep a
+few months of partitions ahead. The primary key becomes (id, created_at), as
+Postgres requires the partition key in every unique constraint.
+
+Downgrade copies the rows still attached back into a plain table; partitions
+already exported by archive_leads.py stay in their Parquet files.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f2d4b6e7a8'
+down_revision: Union[str, None] = 'b8e1c3a5d6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stored columns only; search_vector and phone_digits are generated
+LEAD_COLUMNS = (
+    "id, name, email, phone, initial_message, goal, timeline, budget_range, quality_score, "
+    "is_fraud, fraud_signals, status, assigned_to, created_at, updated_at, source, ip_address, "
+    "needs_requalification"
+)
+
+LEAD_INDEXES = [
+    "CREATE INDEX ix_leads_id ON leads (id)",
+    "CREATE INDEX ix_leads_email ON leads (email)",
+    "CREATE INDEX ix_leads_goal ON leads (goal)",
+    "CREATE INDEX ix_leads_status ON leads (status)",
+    "CREATE INDEX ix_leads_updated_at ON leads (updated_at)",
+    "CREATE INDEX ix_leads_needs_requalification ON leads (needs_requalification)",
+    "CREATE INDEX ix_leads_created_at_id ON leads (created_at, id)",
+    "CREATE INDEX ix_leads_ip_address_created_at ON leads (ip_address, created_at)",
+    "CREATE INDEX ix_leads_search_vector ON leads USING GIN (search_vector)",
+    "CREATE INDEX ix_leads_name_trgm ON leads USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX ix_leads_phone_digits_trgm ON leads USING GIN (phone_digits gin_trgm_ops)",
+]
+
+TOMBSTONE_TRIGGER = (
+    "CREATE TRIGGER leads_tombstone AFTER DELETE ON leads "
+    "FOR EACH ROW EXECUTE FUNCTION record_lead_tombstone()"
+)
+
+# Creates any missing monthly partitions from from_month through
+# months_ahead months past the current (UTC) month; returns how many it made
+CREATE_LEAD_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_lead_partitions(from_month date, months_ahead integer)
+RETURNS integer AS $$
+DECLARE
+    cur_month date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => months_ahead))::date;
+    part_name text;
+    created integer := 0;
+BEGIN
+    WHILE cur_month <= last_month LOOP
+        part_name := 'leads_' || to_char(cur_month, 'YYYY_MM');
+        IF to_regclass(part_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF leads FOR VALUES FROM (%L) TO (%L)',
+                part_name,
+                cur_month::timestamp AT TIME ZONE 'UTC',
+                (cur_month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            created := created + 1;
+        END IF;
+        cur_month := (cur_month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _rebuild_leads(partitioned: bool) -> None:
+    """Swap ``leads`` for a partitioned (or plain) copy with the same rows."""
+
+    op.execute("ALTER TABLE leads RENAME TO leads_old")
+    op.execute(
+        "CREATE TABLE leads (LIKE leads_old INCLUDING DEFAULTS INCLUDING GENERATED)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+
+    if partitioned:
+        op.execute("ALTER TABLE leads ALTER COLUMN created_at SET NOT NULL")
+        op.execute(CREATE_LEAD_PARTITIONS_FUNCTION)
+        op.execute(
+            "SELECT create_lead_partitions("
+            "(coalesce((SELECT min(created_at) FROM leads_old), now()) AT TIME ZONE 'UTC')::date, 3)"
+        )
+        op.execute("CREATE TABLE leads_default PARTITION OF leads DEFAULT")
+
+    op.execute(
+        f"INSERT INTO leads ({LEAD_COLUMNS}) "
+        f"SELECT {LEAD_COLUMNS.replace('created_at,', 'coalesce(created_at, now()),', 1)} FROM leads_old"
+    )
+
+    # The id sequence belongs to the old table; move it before dropping that
+    op.execute("ALTER SEQUENCE leads_id_seq OWNED BY leads.id")
+    op.execute("DROP TABLE leads_old")
+
+    op.execute(f"ALTER TABLE leads ADD PRIMARY KEY ({'id, created_at' if partitioned else 'id'})")
+    for statement in LEAD_INDEXES:
+        op.execute(statement)
+    op.execute(TOMBSTONE_TRIGGER)
+
+
+def upgrade() -> None:
+    op.create_table('lead_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('partition_name', sa.String(length=63), nullable=False),
+    sa.Column('range_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('range_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('min_id', sa.Integer(), nullable=False),
+    sa.Column('max_id', sa.Integer(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('path', sa.Text(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('partition_name')
+    )
+    op.create_index('ix_lead_archives_min_id_max_id', 'lead_archives', ['min_id', 'max_id'], unique=False)
+
+    # SQLite has no declarative partitioning; leads stays a plain table there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _rebuild_leads(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _rebuild_leads(partitioned=False)
+        op.execute("DROP FUNCTION IF EXISTS create_lead_partitions(date, integer)")
+
+    op.drop_index('ix_lead_archives_min_id_max_id', table_name='lead_archives')
+    op.drop_table('lead_archives')
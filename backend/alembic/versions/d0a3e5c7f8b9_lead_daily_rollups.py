@@ -0,0 +1,62 @@
+"""Lead daily rollups
+
+Revision ID: d0a3e5c7f8b9
+Revises: c9f2d4b6e7a8
+Create Date: 2026-10-19 18:10:47.296514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0a3e5c7f8b9'
+down_revision: Union[str, None] = 'c9f2d4b6e7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors app.services.rollups.STATUS_BUCKETS and the stats thresholds
+BACKFILL_SQL = """
+INSERT INTO lead_daily_rollups (day, source, goal, status_bucket, lead_count, score_sum, hot, warm, cold, fraud)
+SELECT {day}, coalesce(source, 'unknown'), coalesce(goal, 'unknown'),
+       CASE WHEN status IN ('contacted', 'meeting_booked') THEN 'in_progress'
+            WHEN status = 'closed' THEN 'closed'
+            WHEN status = 'lost' THEN 'lost'
+            ELSE 'open' END,
+       count(*),
+       coalesce(sum(quality_score), 0),
+       sum(CASE WHEN quality_score >= 70 THEN 1 ELSE 0 END),
+       sum(CASE WHEN quality_score >= 40 AND quality_score < 70 THEN 1 ELSE 0 END),
+       sum(CASE WHEN quality_score < 40 THEN 1 ELSE 0 END),
+       sum(CASE WHEN is_fraud THEN 1 ELSE 0 END)
+FROM leads
+WHERE created_at IS NOT NULL
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def upgrade() -> None:
+    op.create_table('lead_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('goal', sa.String(length=50), nullable=False),
+    sa.Column('status_bucket', sa.String(length=20), nullable=False),
+    sa.Column('lead_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Integer(), nullable=False),
+    sa.Column('hot', sa.Integer(), nullable=False),
+    sa.Column('warm', sa.Integer(), nullable=False),
+    sa.Column('cold', sa.Integer(), nullable=False),
+    sa.Column('fraud', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'source', 'goal', 'status_bucket')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(BACKFILL_SQL.format(day="date(timezone('UTC', created_at))"))
+    else:
+        op.execute(BACKFILL_SQL.format(day="date(created_at)"))
+
+
+def downgrade() -> None:
+    op.drop_table('lead_daily_rollups')
@@ -0,0 +1,63 @@
+"""Lead full-text search
+
+Revision ID: d4a7e9c1f2b3
+Revises: c3f1a2d4e5b6
+Create Date: 2026-10-19 11:04:17.530921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e9c1f2b3'
+down_revision: Union[str, None] = 'c3f1a2d4e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(initial_message, '')), 'B')"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE leads_fts USING fts5("
+    "name, email, initial_message, content='leads', content_rowid='id')",
+    "CREATE TRIGGER leads_fts_ai AFTER INSERT ON leads BEGIN "
+    "INSERT INTO leads_fts(rowid, name, email, initial_message) "
+    "VALUES (new.id, new.name, new.email, new.initial_message); END",
+    "CREATE TRIGGER leads_fts_ad AFTER DELETE ON leads BEGIN "
+    "INSERT INTO leads_fts(leads_fts, rowid, name, email, initial_message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.initial_message); END",
+    "CREATE TRIGGER leads_fts_au AFTER UPDATE OF name, email, initial_message ON leads BEGIN "
+    "INSERT INTO leads_fts(leads_fts, rowid, name, email, initial_message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.initial_message); "
+    "INSERT INTO leads_fts(rowid, name, email, initial_message) "
+    "VALUES (new.id, new.name, new.email, new.initial_message); END",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            f"ALTER TABLE leads ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute("CREATE INDEX ix_leads_search_vector ON leads USING GIN (search_vector)")
+    else:
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO leads_fts(leads_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_leads_search_vector', table_name='leads')
+        op.drop_column('leads', 'search_vector')
+    else:
+        for trigger in ('leads_fts_ai', 'leads_fts_ad', 'leads_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS leads_fts")
@@ -0,0 +1,102 @@
+"""Lead fraud_signals as JSON
+
+Revision ID: e1b4f6d8a9c0
+Revises: d0a3e5c7f8b9
+Create Date: 2026-10-19 19:02:33.815270
+
+fraud_signals held ``str(list)`` (a Python repr). Postgres gets a new jsonb
+column, backfilled in id-ordered chunks that each commit on their own, so no
+long lock is held on leads. A short final pass under lock catches rows written
+meanwhile, then the columns are swapped and a GIN index is added. SQLite
+already stores JSON as text, so the values are rewritten in place.
+"""
+import ast
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b4f6d8a9c0'
+down_revision: Union[str, None] = 'd0a3e5c7f8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHUNK_SIZE = 5000
+
+
+def _to_json(value):
+    """JSON text for a stored signals value (Python repr, JSON or bare string)."""
+
+    if value is None:
+        return None
+    try:
+        signals = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        try:
+            signals = json.loads(value)
+        except ValueError:
+            signals = [value] if value.strip() else []
+    if not isinstance(signals, (list, tuple)):
+        signals = [signals]
+    return json.dumps([str(signal) for signal in signals])
+
+
+def _backfill(conn, source: str, target: str, pending: str, cast: str) -> int:
+    """Convert ``source`` into ``target`` for rows matching ``pending``, CHUNK_SIZE at a time."""
+
+    converted = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            f"SELECT id, {source} FROM leads WHERE id > :last_id AND {pending} ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': CHUNK_SIZE}).all()
+        if not rows:
+            return converted
+
+        conn.execute(
+            sa.text(f"UPDATE leads SET {target} = {cast} WHERE id = :id"),
+            [{'id': row[0], 'signals': _to_json(row[1])} for row in rows]
+        )
+        converted += len(rows)
+        last_id = rows[-1][0]
+        print(f"   fraud_signals: {converted} rows converted (up to id {last_id})")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        with op.get_context().autocommit_block():
+            _backfill(conn, 'fraud_signals', 'fraud_signals', 'fraud_signals IS NOT NULL', ':signals')
+        return
+
+    op.add_column('leads', sa.Column('fraud_signals_json', postgresql.JSONB(), nullable=True))
+
+    pending = 'fraud_signals IS NOT NULL AND fraud_signals_json IS NULL'
+    cast = 'CAST(:signals AS jsonb)'
+    with op.get_context().autocommit_block():
+        _backfill(conn, 'fraud_signals', 'fraud_signals_json', pending, cast)
+
+    # Rows inserted by the old code while the backfill ran
+    op.execute("LOCK TABLE leads IN ACCESS EXCLUSIVE MODE")
+    _backfill(conn, 'fraud_signals', 'fraud_signals_json', pending, cast)
+
+    op.drop_column('leads', 'fraud_signals')
+    op.alter_column('leads', 'fraud_signals_json', new_column_name='fraud_signals')
+    op.execute("CREATE INDEX ix_leads_fraud_signals ON leads USING GIN (fraud_signals jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    # SQLite keeps the JSON text; the Text column reads it back unchanged
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_leads_fraud_signals")
+    op.add_column('leads', sa.Column('fraud_signals_text', sa.Text(), nullable=True))
+    op.execute("UPDATE leads SET fraud_signals_text = fraud_signals::text")
+    op.drop_column('leads', 'fraud_signals')
+    op.alter_column('leads', 'fraud_signals_text', new_column_name='fraud_signals')
@@ -0,0 +1,41 @@
+"""Lead trigram lookup
+
+Revision ID: e5b8f0d2a3c4
+Revises: d4a7e9c1f2b3
+Create Date: 2026-10-19 12:21:55.240716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8f0d2a3c4'
+down_revision: Union[str, None] = 'd4a7e9c1f2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite deployments use the in-process n-gram index instead
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "ALTER TABLE leads ADD COLUMN phone_digits varchar(20) "
+        "GENERATED ALWAYS AS (regexp_replace(phone, '\\D', '', 'g')) STORED"
+    )
+    op.execute("CREATE INDEX ix_leads_name_trgm ON leads USING GIN (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_leads_phone_digits_trgm ON leads USING GIN (phone_digits gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_leads_phone_digits_trgm', table_name='leads')
+    op.drop_index('ix_leads_name_trgm', table_name='leads')
+    op.drop_column('leads', 'phone_digits')
@@ -0,0 +1,90 @@
+"""Lead categorical columns as enums
+
+Revision ID: f2c5a7b9d0e1
+Revises: e1b4f6d8a9c0
+Create Date: 2026-10-19 19:48:05.602184
+
+Existing goal/timeline/budget_range/status values are first mapped onto the
+allowed set (one UPDATE per distinct stray value). On Postgres the four
+columns then become native enum types in a single ALTER TABLE, i.e. one
+table rewrite. SQLite keeps text columns and only gets the value cleanup.
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c5a7b9d0e1'
+down_revision: Union[str, None] = 'e1b4f6d8a9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# column -> (enum type, allowed values, value for anything unrecognised, aliases)
+ENUMS = {
+    'goal': ('lead_goal',
+             ('investment', 'retirement', 'insurance', 'tax', 'wealth_management', 'unclear'),
+             'unclear', {'wealth': 'wealth_management', 'unknown': 'unclear'}),
+    'timeline': ('lead_timeline',
+                 ('immediate', '1-3_months', '6-12_months', '5+_years', 'unclear'),
+                 'unclear', {'asap': 'immediate', 'unknown': 'unclear'}),
+    'budget_range': ('lead_budget_range',
+                     ('<5L', '5-20L', '20-50L', '50L+', 'not_disclosed'),
+                     'not_disclosed', {'>50L': '50L+', 'unknown': 'not_disclosed', 'unclear': 'not_disclosed'}),
+    'status': ('lead_status',
+               ('new', 'assigned', 'contacted', 'meeting_booked', 'closed', 'lost'),
+               'new', {}),
+}
+
+
+def _key(value: str) -> str:
+    key = re.sub(r"[\s_\-]+", "", value.lower())
+    return re.sub(r"(lakhs?|lacs?)", "l", key)
+
+
+def _normalize_existing(conn) -> None:
+    for column, (_, values, default, aliases) in ENUMS.items():
+        lookup = {_key(value): value for value in values}
+        lookup.update({_key(alias): value for alias, value in aliases.items()})
+
+        stray = conn.execute(sa.text(
+            f"SELECT DISTINCT {column} FROM leads WHERE {column} IS NOT NULL AND {column} NOT IN :allowed"
+        ).bindparams(sa.bindparam('allowed', expanding=True)), {'allowed': list(values)}).scalars().all()
+
+        for value in stray:
+            conn.execute(sa.text(f"UPDATE leads SET {column} = :new WHERE {column} = :old"),
+                         {'new': lookup.get(_key(value), default), 'old': value})
+        if stray:
+            print(f"   {column}: normalized {len(stray)} distinct stray values")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    _normalize_existing(conn)
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    for _, (type_name, values, _, _) in ENUMS.items():
+        postgresql.ENUM(*values, name=type_name).create(conn, checkfirst=True)
+
+    op.execute("ALTER TABLE leads " + ", ".join(
+        f"ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}"
+        for column, (type_name, *_) in ENUMS.items()
+    ))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE leads " + ", ".join(
+        f"ALTER COLUMN {column} TYPE varchar(50) USING {column}::text"
+        for column in ENUMS
+    ))
+    for _, (type_name, *_) in ENUMS.items():
+        postgresql.ENUM(name=type_name).drop(conn, checkfirst=True)
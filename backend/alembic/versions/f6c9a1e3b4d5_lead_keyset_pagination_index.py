@@ -0,0 +1,26 @@
+"""Lead keyset pagination index
+
+Revision ID: f6c9a1e3b4d5
+Revises: e5b8f0d2a3c4
+Create Date: 2026-10-19 13:40:08.671532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c9a1e3b4d5'
+down_revision: Union[str, None] = 'e5b8f0d2a3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_leads_created_at_id', 'leads', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leads_created_at_id', table_name='leads')
@@ -1,35 +1,182 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import insert, update, any_, bindparam, Integer, text, or_, and_, func, case, exists, false, select, type_coerce
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 from . import models, schemas
+from .services.activity_log import record_activity
+from .services import group_commit, fuzzy_index, events, lead_archive, rollups, scoring, assignment
+from .services.cache import cache
 from typing import List, Optional
 
 
-def create_lead(db: Session, lead: schemas.LeadCreate, qualification: dict, fraud_check: dict) -> models.Lead:
-    """Create a new lead in database"""
-    
-    db_lead = models.Lead(
-        name=lead.name,
-        email=lead.email,
-        phone=lead.phone,
-        initial_message=lead.initial_message,
-        source=lead.source,
-        goal=qualification.get('goal'),
-        timeline=qualification.get('timeline'),
-        budget_range=qualification.get('budget_range'),
-        quality_score=qualification.get('quality_score'),
-        is_fraud=fraud_check.get('is_fraud', False),
-        fraud_signals=str(fraud_check.get('signals', []))
-    )
+def _lead_values(lead: schemas.LeadCreate, qualification: dict, fraud_check: dict,
+                 ip_address: Optional[str] = None, needs_requalification: bool = False) -> dict:
+    """Column values for a new lead row"""
     
-    db.add(db_lead)
-    db.commit()
-    db.refresh(db_lead)
+    return {
+        'name': lead.name,
+        'email': lead.email,
+        'phone': lead.phone,
+        'initial_message': lead.initial_message,
+        'source': lead.source,
+        'goal': qualification.get('goal'),
+        'timeline': qualification.get('timeline'),
+        'budget_range': qualification.get('budget_range'),
+        'clarity': qualification.get('clarity'),
+        'completeness': qualification.get('completeness'),
+        'quality_score': qualification.get('quality_score'),
+        'score_version': qualification.get('score_version'),
+        'is_fraud': fraud_check.get('is_fraud', False),
+        'fraud_signals': fraud_check.get('signals', []),
+        'needs_requalification': needs_requalification,
+        'ip_address': ip_address,
+        'status': 'new',
+        'assigned_to': None,
+    }
+
+
+def create_lead(db: Session, lead: schemas.LeadCreate, qualification: dict, fraud_check: dict,
+                ip_address: Optional[str] = None, needs_requalification: bool = False,
+                timeout: Optional[float] = None):
+    """Create a new lead with a single INSERT ... RETURNING round-trip
+    
+    ``timeout`` (seconds) becomes the Postgres statement_timeout for the insert.
+    """
+    
+    values = _lead_values(lead, qualification, fraud_check, ip_address, needs_requalification)
+    
+    # Hot/warm leads go to the least-loaded advisor as part of the same INSERT
+    advisor = None
+    if assignment.ENABLED and (values['quality_score'] or 0) >= assignment.MIN_SCORE:
+        if assignment.pool.stale():
+            assignment.pool.seed(get_advisor_loads(db))
+        advisor = assignment.pool.take()
+        if advisor:
+            values.update(assigned_to=advisor, status='assigned')
+    
+    try:
+        if group_commit.ENABLED:
+            db_lead = group_commit.get_lead_writer().submit(values, timeout=timeout)
+        else:
+            leads = models.Lead.__table__
+            if timeout is not None and db.bind.dialect.name == 'postgresql':
+                # Transaction-local, so pooled connections keep their default
+                db.execute(text("SELECT set_config('statement_timeout', :ms, true)"),
+                           {'ms': str(max(1, int(timeout * 1000)))})
+            db_lead = db.execute(insert(leads).values(**values).returning(*leads.c)).one()
+            db.commit()
+    except Exception:
+        if advisor:
+            assignment.pool.adjust(advisor, -1)
+        raise
+    
+    cache.invalidate('stats')
+    rollups.add_lead(db_lead)
+    fuzzy_index.add_lead(db_lead.id, db_lead.name, db_lead.phone)
+    events.publish('lead_created', _lead_dict(db_lead))
+    events.publish('stats_delta', events.stats_delta(db_lead.quality_score, db_lead.is_fraud))
+    record_activity(db_lead.id, 'created', f"Lead created via {db_lead.source} (score {db_lead.quality_score})")
+    if advisor:
+        record_activity(db_lead.id, 'assigned', f"Auto-assigned to {advisor}")
     
     return db_lead
 
 
-def get_lead(db: Session, lead_id: int) -> Optional[models.Lead]:
-    """Get single lead by ID"""
-    return db.query(models.Lead).filter(models.Lead.id == lead_id).first()
+def get_advisor_loads(db: Session) -> dict:
+    """Open-lead count per active advisor (by email), from one aggregate query"""
+    
+    lead, user = models.Lead, models.User
+    rows = db.query(user.email, func.count(lead.id)).outerjoin(
+        lead, and_(lead.assigned_to == user.email, lead.status.in_(assignment.OPEN_STATUSES))
+    ).filter(user.role == 'advisor', user.is_active == True).group_by(user.email).all()
+    return dict(rows)
+
+
+def count_recent_leads_from_ip(db: Session, ip_address: str, window_seconds: int) -> int:
+    """Leads submitted from one IP within the last ``window_seconds``"""
+    
+    # Database clock, so the window lines up with server-default created_at
+    cutoff = db.query(func.now()).scalar() - timedelta(seconds=window_seconds)
+    return db.query(func.count(models.Lead.id)).filter(
+        models.Lead.ip_address == ip_address,
+        _comparable(db, models.Lead.created_at) >= _comparable(db, cutoff),
+    ).scalar()
+
+
+STATS_TTL = 10
+LEAD_TTL = 300
+
+
+def _lead_dict(row) -> dict:
+    """JSON-ready lead, shaped like the API response"""
+    return schemas.LeadResponse.model_validate(row).model_dump(mode='json')
+
+
+def get_lead(db: Session, lead_id: int) -> Optional[dict]:
+    """Get single lead by ID (cached)"""
+    
+    lead = cache.get('lead', lead_id)
+    if lead is not None:
+        return lead
+    
+    db_lead = db.query(models.Lead).filter(models.Lead.id == lead_id).first()
+    if not db_lead:
+        # Old months may have been moved out to Parquet by archive_leads.py
+        db_lead = lead_archive.read_archived_lead(db, lead_id)
+    if not db_lead:
+        return None
+    
+    lead = _lead_dict(db_lead)
+    # A lagging replica can return a row older than a write the primary already has,
+    # and caching it would hand that stale row to every client; only the primary fills
+    if not db.info.get('replica'):
+        cache.set('lead', lead_id, lead, ttl=LEAD_TTL)
+    return lead
+
+
+def _signal_filter(db: Session, signal: str):
+    """Leads whose fraud_signals list contains ``signal``
+    
+    Postgres: JSONB containment, served by the GIN index. SQLite: json_each.
+    """
+    
+    if db.bind.dialect.name == 'postgresql':
+        return type_coerce(models.Lead.fraud_signals, postgresql.JSONB).contains([signal])
+    
+    signals = func.json_each(models.Lead.fraud_signals).table_valued('value')
+    return exists(select(1).select_from(signals).where(signals.c.value == signal))
+
+
+def _lead_filters(
+    db: Session,
+    status: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    signal: Optional[str] = None,
+    created_after: Optional[datetime] = None
+) -> list:
+    """Build WHERE clauses shared by list and bulk-update queries"""
+    
+    clauses = []
+    
+    if status:
+        # An unknown status matches nothing (and is not a valid enum literal on Postgres)
+        clauses.append(models.Lead.status == status if status in models.LEAD_STATUSES else false())
+    
+    if min_score is not None:
+        clauses.append(models.Lead.quality_score >= min_score)
+    
+    if max_score is not None:
+        clauses.append(models.Lead.quality_score <= max_score)
+    
+    if signal:
+        clauses.append(_signal_filter(db, signal))
+    
+    if created_after is not None:
+        clauses.append(_comparable(db, models.Lead.created_at) >= _comparable(db, created_after))
+    
+    return clauses
 
 
 def get_leads(
@@ -38,43 +185,360 @@ def get_leads(
     limit: int = 100,
     status: Optional[str] = None,
     min_score: Optional[int] = None,
-    max_score: Optional[int] = None
+    max_score: Optional[int] = None,
+    cursor: Optional[str] = None,
+    signal: Optional[str] = None,
+    created_after: Optional[datetime] = None
 ) -> List[models.Lead]:
-    """Get leads with filters"""
+    """Get leads with filters, newest first; pass cursor (from next_cursor) to page without OFFSET"""
     
-    query = db.query(models.Lead)
+    query = db.query(models.Lead).filter(*_lead_filters(db, status, min_score, max_score, signal, created_after))
     
-    if status:
-        query = query.filter(models.Lead.status == status)
+    if cursor:
+        after_created, after_id = _decode_cursor(cursor)
+        created_at = _comparable(db, models.Lead.created_at)
+        after_created = _comparable(db, after_created)
+        query = query.filter(or_(
+            created_at < after_created,
+            and_(created_at == after_created, models.Lead.id < after_id)
+        ))
     
-    if min_score is not None:
-        query = query.filter(models.Lead.quality_score >= min_score)
+    query = query.order_by(models.Lead.created_at.desc(), models.Lead.id.desc())
     
-    if max_score is not None:
-        query = query.filter(models.Lead.quality_score <= max_score)
+    return query.offset(skip).limit(limit).all()
+
+
+def _comparable(db: Session, value):
+    """Timestamp column/value wrapped so comparisons are chronological on every backend.
+    
+    SQLite stores server-default timestamps as text without fractional seconds,
+    so compare there as Julian day numbers rather than strings.
+    """
     
-    return query.order_by(models.Lead.created_at.desc()).offset(skip).limit(limit).all()
+    if db.bind.dialect.name != 'sqlite':
+        return value
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=' ')
+    return func.julianday(value)
 
 
-def update_lead(db: Session, lead_id: int, lead_update: schemas.LeadUpdate) -> Optional[models.Lead]:
-    """Update lead status/assignment"""
+def _decode_cursor(cursor: str):
+    created_at, lead_id = cursor.rsplit('|', 1)
+    return datetime.fromisoformat(created_at), int(lead_id)
+
+
+def next_cursor(leads: list, limit: int) -> Optional[str]:
+    """Keyset cursor for the page after ``leads``; None when this was the last page"""
     
-    db_lead = get_lead(db, lead_id)
-    if not db_lead:
+    if len(leads) < limit:
         return None
     
-    update_data = lead_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_lead, field, value)
+    last = leads[-1]
+    return f"{last.created_at.isoformat()}|{last.id}"
+
+
+# Rows committed by transactions that started before the last poll can carry an
+# earlier timestamp, so a caught-up token re-reads this many seconds
+CHANGE_FEED_OVERLAP = timedelta(seconds=5)
+
+
+def get_lead_changes(db: Session, since: Optional[str] = None, limit: int = 500) -> dict:
+    """Leads created/updated and ids deleted after ``since``, oldest change first.
+    
+    Tokens are opaque to clients. Mid-page tokens are exact keyset positions
+    (timestamp|id); a caught-up token is a timestamp slightly in the past, so
+    clients must merge by id (some rows may be sent twice).
+    """
+    
+    changed_at = func.coalesce(models.Lead.updated_at, models.Lead.created_at)
+    query = db.query(models.Lead)
+    tombstones = db.query(models.LeadTombstone.lead_id)
+    
+    if since:
+        after_ts, _, after_id = since.partition('|')
+        after_ts = datetime.fromisoformat(after_ts)
+        after = _comparable(db, after_ts)
+        
+        # The OR of the two indexed columns lets Postgres use both indexes
+        query = query.filter(or_(
+            _comparable(db, models.Lead.updated_at) >= after,
+            _comparable(db, models.Lead.created_at) >= after
+        ))
+        if after_id:
+            query = query.filter(or_(
+                _comparable(db, changed_at) > after,
+                and_(_comparable(db, changed_at) == after, models.Lead.id > int(after_id))
+            ))
+        tombstones = tombstones.filter(_comparable(db, models.LeadTombstone.deleted_at) >= after)
+    
+    leads = query.order_by(changed_at, models.Lead.id).limit(limit).all()
+    
+    if len(leads) == limit:
+        last = leads[-1]
+        token = f"{(last.updated_at or last.created_at).isoformat()}|{last.id}"
+        has_more = True
+    else:
+        latest = max((lead.updated_at or lead.created_at for lead in leads), default=None)
+        if latest is None:
+            # Nothing new: keep the caller's position (or start from the db clock)
+            token = since or (db.query(func.now()).scalar() - CHANGE_FEED_OVERLAP).isoformat()
+        else:
+            token = (latest - CHANGE_FEED_OVERLAP).isoformat()
+        has_more = False
+    
+    return {
+        'changes': leads,
+        'deleted_ids': [row.lead_id for row in tombstones.all()],
+        'next_token': token,
+        'has_more': has_more
+    }
+
+
+# Every lead column, aliased for the raw search and lookup queries
+_LEAD_COLUMNS = ", ".join(f"l.{c.name}" for c in models.Lead.__table__.c)
+
+
+def _search_sql(dialect: str, with_cursor: bool) -> str:
+    """Ranked full-text query; higher rank is better on both backends"""
+    
+    if dialect == 'postgresql':
+        inner = f"""
+            SELECT {_LEAD_COLUMNS}, ts_rank(l.search_vector, q) AS rank
+            FROM leads l, plainto_tsquery('simple', :q) q
+            WHERE l.search_vector @@ q
+        """
+    else:
+        inner = f"""
+            SELECT {_LEAD_COLUMNS}, -bm25(leads_fts) AS rank
+            FROM leads_fts JOIN leads l ON l.id = leads_fts.rowid
+            WHERE leads_fts MATCH :q
+        """
+    
+    # Cast so the cursor compares at the rank column's own precision (real on Postgres)
+    cursor = (
+        "WHERE rank < CAST(:after_rank AS REAL) "
+        "OR (rank = CAST(:after_rank AS REAL) AND id < :after_id)"
+    ) if with_cursor else ""
+    
+    return f"SELECT * FROM ({inner}) ranked {cursor} ORDER BY rank DESC, id DESC LIMIT :limit"
+
+
+def search_leads(db: Session, q: str, limit: int = 50, cursor: Optional[str] = None) -> dict:
+    """Ranked full-text search with keyset pagination on (rank, id)"""
+    
+    dialect = db.bind.dialect.name
+    terms = re.findall(r"[\w@.+-]+", q.lower())
+    if not terms:
+        return {'results': [], 'next_cursor': None}
+    
+    params = {'limit': limit}
+    if dialect == 'postgresql':
+        params['q'] = " ".join(terms)
+    else:
+        # Quote each term so FTS5 treats punctuation literally; terms are ANDed
+        params['q'] = " ".join('"' + t.replace('"', '') + '"' for t in terms)
+    
+    if cursor:
+        after_rank, after_id = cursor.rsplit(':', 1)
+        params['after_rank'] = float(after_rank)
+        params['after_id'] = int(after_id)
+    
+    rows = db.execute(text(_search_sql(dialect, cursor is not None)), params).all()
+    
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = f"{rows[-1].rank!r}:{rows[-1].id}"
     
+    return {'results': rows, 'next_cursor': next_cursor}
+
+
+def _refresh_fuzzy_index(db: Session) -> None:
+    """Build this process's lookup index once, then catch up with every worker's writes via the change feed"""
+    
+    if not fuzzy_index.is_built():
+        fuzzy_index.build(db, (db.query(func.now()).scalar() - CHANGE_FEED_OVERLAP).isoformat())
+    
+    token = fuzzy_index.claim_refresh()
+    while token is not None:
+        page = get_lead_changes(db, token)
+        fuzzy_index.apply_changes(page['changes'], page['deleted_ids'], page['next_token'])
+        token = page['next_token'] if page['has_more'] else None
+
+
+def lookup_leads(db: Session, q: str, limit: int = 10) -> list:
+    """Fuzzy lookup by partial/misspelled name, or by partial phone number when q has 3+ digits"""
+    
+    digits = fuzzy_index.normalize_phone(q)
+    by_phone = len(digits) >= 3
+    
+    if db.bind.dialect.name == 'postgresql':
+        if by_phone:
+            sql = f"""
+                SELECT {_LEAD_COLUMNS}, 1.0 AS score FROM leads l
+                WHERE l.phone_digits LIKE :pattern
+                ORDER BY l.id DESC LIMIT :limit
+            """
+            params = {'pattern': f"%{digits}%", 'limit': limit}
+        else:
+            sql = f"""
+                SELECT {_LEAD_COLUMNS}, word_similarity(:q, l.name) AS score FROM leads l
+                WHERE :q <% l.name
+                ORDER BY score DESC, l.id DESC LIMIT :limit
+            """
+            params = {'q': q, 'limit': limit}
+        return db.execute(text(sql), params).all()
+    
+    _refresh_fuzzy_index(db)
+    if by_phone:
+        matches = fuzzy_index.lookup_phone(digits, limit)
+    else:
+        matches = fuzzy_index.lookup_name(q, limit)
+    
+    if not matches:
+        return []
+    
+    scores = dict(matches)
+    leads = db.query(models.Lead).filter(models.Lead.id.in_(scores)).all()
+    leads.sort(key=lambda lead: (scores[lead.id], lead.id), reverse=True)
+    for lead in leads:
+        lead.score = scores[lead.id]
+    
+    return leads
+
+
+def _id_in(db: Session, ids: List[int]):
+    """id = ANY(:ids) on Postgres (one array bind, stable statement text), IN elsewhere"""
+    
+    if db.bind.dialect.name == 'postgresql':
+        return models.Lead.id == any_(bindparam('ids', ids, type_=postgresql.ARRAY(Integer)))
+    return models.Lead.id.in_(ids)
+
+
+def _update_returning(db: Session, where: list, values: dict) -> list:
+    """Run one UPDATE ... RETURNING statement and commit; returns the updated rows"""
+    
+    leads = models.Lead.__table__
+    # A status change moves leads between rollup buckets, so the old status comes back too
+    moved = 'status' in values
+    # Likewise status/assignment changes move open leads between advisors
+    reassigned = assignment.ENABLED and bool(values.keys() & {'status', 'assigned_to'})
+    
+    previous = {}
+    if not (moved or reassigned):
+        rows = db.execute(update(leads).where(*where).values(**values).returning(*leads.c)).all()
+    elif db.bind.dialect.name == 'postgresql':
+        # Lock the matching rows and read their old status/assignee in the same statement
+        old = select(leads.c.id, leads.c.status, leads.c.assigned_to).where(*where).with_for_update().subquery('old')
+        rows = db.execute(
+            update(leads).where(leads.c.id == old.c.id).values(**values)
+            .returning(*leads.c, old.c.status.label('old_status'), old.c.assigned_to.label('old_assigned_to'))
+        ).all()
+        previous = {row.id: (row.old_status, row.old_assigned_to) for row in rows}
+    else:
+        # SQLite can't RETURN columns of an UPDATE ... FROM table; read them in the same transaction
+        previous = {
+            row.id: (row.status, row.assigned_to)
+            for row in db.execute(select(leads.c.id, leads.c.status, leads.c.assigned_to).where(*where))
+        }
+        rows = db.execute(update(leads).where(*where).values(**values).returning(*leads.c)).all()
     db.commit()
-    db.refresh(db_lead)
     
-    return db_lead
+    loads = {}
+    for row in rows:
+        if row.id not in previous:
+            continue
+        old_status, old_assignee = previous[row.id]
+        
+        if moved and rollups.status_bucket(old_status) != rollups.status_bucket(row.status):
+            metrics = rollups.lead_metrics(row.quality_score, row.is_fraud)
+            rollups.add(row.created_at, row.source, row.goal, old_status, metrics, -1, changed_at=row.updated_at)
+            rollups.add(row.created_at, row.source, row.goal, row.status, metrics, +1, changed_at=row.updated_at)
+        
+        if reassigned:
+            if old_assignee and old_status in assignment.OPEN_STATUSES:
+                loads[old_assignee] = loads.get(old_assignee, 0) - 1
+            if row.assigned_to and row.status in assignment.OPEN_STATUSES:
+                loads[row.assigned_to] = loads.get(row.assigned_to, 0) + 1
+    
+    for advisor, delta in loads.items():
+        if delta:
+            assignment.pool.adjust(advisor, delta)
+    
+    for row in rows:
+        cache.delete('lead', row.id)
+        _record_changes(row.id, values)
+        events.publish('lead_updated', _lead_dict(row))
+    
+    return rows
+
+
+def update_lead(db: Session, lead_id: int, lead_update: schemas.LeadUpdate):
+    """Update lead status/assignment in a single UPDATE ... RETURNING round-trip"""
+    
+    update_data = lead_update.dict(exclude_unset=True)
+    if not update_data:
+        return get_lead(db, lead_id)
+    
+    rows = _update_returning(db, [models.Lead.id == lead_id], update_data)
+    
+    return rows[0] if rows else None
+
+
+# Most leads one filter-based bulk update may touch (id lists are capped by the schema)
+BULK_UPDATE_MAX_ROWS = 10000
+
+
+def _bulk_update_where(db: Session, bulk_update: schemas.LeadBulkUpdate) -> list:
+    where = []
+    if bulk_update.ids is not None:
+        where.append(_id_in(db, bulk_update.ids))
+    if bulk_update.filter is not None:
+        where.extend(_lead_filters(db, **bulk_update.filter.dict()))
+    return where
+
+
+def count_bulk_update_targets(db: Session, bulk_update: schemas.LeadBulkUpdate) -> int:
+    """Number of leads a bulk update would change"""
+    
+    return db.query(func.count(models.Lead.id)).filter(*_bulk_update_where(db, bulk_update)).scalar()
+
+
+def bulk_update_leads(db: Session, bulk_update: schemas.LeadBulkUpdate) -> list:
+    """Update every lead matching ids and/or filter with one UPDATE ... RETURNING"""
+    
+    update_data = bulk_update.dict(include={'status', 'assigned_to'}, exclude_unset=True)
+    where = _bulk_update_where(db, bulk_update)
+    if not where:
+        # Never issue an UPDATE without a WHERE clause
+        raise ValueError("bulk update needs ids or filter criteria")
+    
+    return _update_returning(db, where, update_data)
+
+
+def _record_changes(lead_id: int, values: dict) -> None:
+    """Log status/assignment updates as activity rows"""
+    
+    if 'status' in values:
+        record_activity(lead_id, 'status_changed', f"Status set to {values['status']}", created_by='api')
+    
+    if 'assigned_to' in values:
+        record_activity(lead_id, 'assigned', f"Assigned to {values['assigned_to'] or 'nobody'}", created_by='api')
+
+
+def get_lead_activities(db: Session, lead_id: int, skip: int = 0, limit: int = 100) -> List[models.LeadActivity]:
+    """Get a lead's activity timeline, newest first"""
+    
+    return db.query(models.LeadActivity).filter(
+        models.LeadActivity.lead_id == lead_id
+    ).order_by(models.LeadActivity.created_at.desc()).offset(skip).limit(limit).all()
 
 
 def get_lead_stats(db: Session) -> dict:
-    """Get dashboard statistics"""
+    """Get dashboard statistics (cached for a few seconds, dropped on every new lead)"""
+    
+    stats = cache.get('stats', 'all')
+    if stats is not None:
+        return stats
     
     total = db.query(models.Lead).count()
     hot = db.query(models.Lead).filter(models.Lead.quality_score >= 70).count()
@@ -85,10 +549,143 @@ def get_lead_stats(db: Session) -> dict:
     cold = db.query(models.Lead).filter(models.Lead.quality_score < 40).count()
     fraud = db.query(models.Lead).filter(models.Lead.is_fraud == True).count()
     
-    return {
+    stats = {
         'total': total,
         'hot': hot,
         'warm': warm,
         'cold': cold,
         'fraud': fraud
-    }
\ No newline at end of file
+    }
+    cache.set('stats', 'all', stats, ttl=STATS_TTL)
+    
+    return stats
+
+
+
+def rescore_leads(db: Session, version: int = scoring.SCORE_VERSION) -> int:
+    """Recompute quality_score from stored features with weight table ``version``; returns rows updated
+    
+    One set-based UPDATE with no LLM calls. Leads already on ``version`` are skipped.
+    """
+    
+    lead = models.Lead
+    columns = {feature: getattr(lead, feature) for feature in scoring.FEATURES}
+    result = db.execute(
+        update(lead)
+        .where(or_(lead.score_version.is_(None), lead.score_version != version))
+        .values(quality_score=scoring.score_expression(columns, version), score_version=version)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    
+    cache.invalidate('lead')
+    cache.invalidate('stats')
+    return result.rowcount
+
+ROLLUP_GROUPS = ('source', 'goal', 'status_bucket')
+
+
+def _rollup_day(db: Session):
+    """UTC calendar day of created_at"""
+    
+    if db.bind.dialect.name == 'postgresql':
+        return func.date(func.timezone('UTC', models.Lead.created_at))
+    return func.date(models.Lead.created_at)
+
+
+def _rollup_groups(db: Session, where: list) -> list:
+    """(day, source, goal, status, *rollups.METRICS) for the leads matching ``where``"""
+    
+    score = models.Lead.quality_score
+    day = _rollup_day(db)
+    
+    return db.query(
+        day, models.Lead.source, models.Lead.goal, models.Lead.status,
+        func.count(models.Lead.id),
+        func.coalesce(func.sum(score), 0),
+        func.sum(case((score >= rollups.HOT_SCORE, 1), else_=0)),
+        func.sum(case((and_(score >= rollups.WARM_SCORE, score < rollups.HOT_SCORE), 1), else_=0)),
+        func.sum(case((score < rollups.WARM_SCORE, 1), else_=0)),
+        func.sum(case((models.Lead.is_fraud == True, 1), else_=0)),
+    ).filter(*where).group_by(day, models.Lead.source, models.Lead.goal, models.Lead.status).all()
+
+
+def reconcile_daily_rollups(db: Session, start: date, end: date) -> int:
+    """Rebuild rollup rows for days ``start``..``end`` from leads; returns rows written
+    
+    Days before the oldest lead still in the table (archived months) are left as they are.
+    A fence row tells API workers' rollup flushes to drop deltas this recount already covers.
+    """
+    
+    rollups.flush()
+    
+    oldest = db.query(func.min(models.Lead.created_at)).scalar()
+    if oldest is None:
+        return 0
+    start = max(start, rollups.lead_day(oldest))
+    if start > end:
+        return 0
+    
+    start_ts = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    end_ts = datetime(end.year, end.month, end.day, tzinfo=timezone.utc) + timedelta(days=1)
+    created_at = _comparable(db, models.Lead.created_at)
+    
+    if db.bind.dialect.name == 'postgresql':
+        # Flushes wait until this commits; changes from before the fence are in the recount below
+        db.execute(text(rollups.LOCK_SQL.format(mode="")))
+        fenced_at = db.query(func.clock_timestamp()).scalar()
+    else:
+        fenced_at = db.query(func.now()).scalar()
+    fence = models.LeadRollupFence
+    db.query(fence).filter(
+        _comparable(db, fence.fenced_at) < _comparable(db, fenced_at - timedelta(days=1))
+    ).delete(synchronize_session=False)
+    db.execute(insert(fence).values(day_from=start, day_to=end, fenced_at=fenced_at))
+    
+    totals = {}
+    for day, source, goal, status, *metrics in _rollup_groups(
+        db, [created_at >= _comparable(db, start_ts), created_at < _comparable(db, end_ts)]
+    ):
+        row = totals.setdefault(rollups.rollup_key(day, source, goal, status), [0] * len(rollups.METRICS))
+        for i, value in enumerate(metrics):
+            row[i] += value
+    
+    table = models.LeadDailyRollup
+    db.query(table).filter(table.day >= start, table.day <= end).delete(synchronize_session=False)
+    if totals:
+        db.execute(insert(table), [
+            dict(zip(('day', 'source', 'goal', 'status_bucket'), key), **dict(zip(rollups.METRICS, metrics)))
+            for key, metrics in totals.items()
+        ])
+    db.commit()
+    
+    return len(totals)
+
+
+def get_daily_rollups(db: Session, start: date, end: date, group_by: Optional[str] = None) -> list:
+    """Daily lead volume and score tallies from lead_daily_rollups, optionally split by one key"""
+    
+    table = models.LeadDailyRollup
+    keys = [table.day] + ([getattr(table, group_by)] if group_by else [])
+    lead_count = func.sum(table.lead_count)
+    
+    rows = db.query(
+        *keys, lead_count, func.sum(table.score_sum),
+        func.sum(table.hot), func.sum(table.warm), func.sum(table.cold), func.sum(table.fraud)
+    ).filter(table.day >= start, table.day <= end).group_by(*keys).having(lead_count > 0).order_by(*keys).all()
+    
+    points = []
+    for row in rows:
+        day, group = row[0], (row[1] if group_by else None)
+        leads, score_sum, hot, warm, cold, fraud = row[len(keys):]
+        points.append({
+            'day': day,
+            'group': group,
+            'leads': leads,
+            'avg_score': round(score_sum / leads, 1),
+            'hot': hot,
+            'warm': warm,
+            'cold': cold,
+            'fraud': fraud,
+        })
+    return points
@@ -1,7 +1,9 @@
+from fastapi import Request, Response
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +25,18 @@ engine = create_engine(DATABASE_URL)
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for dashboard/analytics GETs; defaults to the primary
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+read_engine = create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=read_engine,
+    info={'replica': read_engine is not engine}
+)
+
+# After a write, that client's reads stay on the primary this long (replica lag)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+RECENT_WRITE_COOKIE = "recent_write"
+
 # Base class for models
 Base = declarative_base()
 
@@ -30,6 +44,32 @@ Base = declarative_base()
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db(response: Response):
+    """Primary session for endpoints that write; pins the client's reads to the primary briefly"""
+    
+    if read_engine is not engine:
+        response.set_cookie(
+            RECENT_WRITE_COOKIE, str(time.time() + READ_YOUR_WRITES_SECONDS),
+            max_age=READ_YOUR_WRITES_SECONDS, httponly=True
+        )
+    yield from get_db()
+
+
+def get_read_db(request: Request):
+    """Replica session for GET endpoints, or the primary if this client wrote recently"""
+    
+    try:
+        recent_write = float(request.cookies.get(RECENT_WRITE_COOKIE, 0)) > time.time()
+    except ValueError:
+        recent_write = False
+    
+    db = SessionLocal() if recent_write else ReadSessionLocal()
     try:
         yield db
     finally:
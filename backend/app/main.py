@@ -1,13 +1,18 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, BackgroundTasks, Depends, Header, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
 
 from . import models, schemas, crud
-from .database import engine, get_db
-from .services.groq_ai import qualify_lead
+from .database import engine, get_db, get_read_db, get_write_db
+from .services.qualifier import qualify_lead, get_qualifier_stats
+from .services import local_classifier, activity_log, events, admission, rule_scoring, lead_archive, rollups, email_service, assignment, idempotency
+from .services.deadline import Deadline, DeadlineExceeded, WRITE_RESERVE, MIN_WRITE_BUDGET, NOTIFY_BUDGET
+from .services.groq_ai import is_fallback
+from .services.cache import cache
 from .services.fraud_detection import detect_fraud
-from .services.email_service import send_hot_lead_notification
 
 # ✅ AUTO-CREATE DATABASE TABLES
 print("=" * 60)
@@ -18,6 +23,18 @@ try:
     print("✅ Database tables ready!")
 except Exception as e:
     print(f"⚠️  Database initialization warning: {e}")
+
+# Keep a few months of lead partitions ready (Postgres, once partitioned), now and periodically
+try:
+    created = lead_archive.ensure_partitions(engine)
+    if created:
+        print(f"✅ Created {created} lead partition(s)")
+except Exception as e:
+    print(f"⚠️  Lead partition maintenance warning: {e}")
+lead_archive.start_maintenance(engine)
+
+# Memory-map the distilled classifier, if one has been trained
+local_classifier.load_model()
 print("=" * 60)
 
 app = FastAPI(
@@ -47,6 +64,15 @@ def read_root():
     }
 
 
+@app.on_event("shutdown")
+def flush_activity_log():
+    """Write any buffered activity rows, rollup deltas and queued digest leads, and stop partition upkeep, before the worker exits"""
+    activity_log.shutdown()
+    rollups.shutdown()
+    email_service.shutdown()
+    lead_archive.shutdown()
+
+
 #@app.get("/health")
 #def health_check():
 #    """Alternative health check endpoint"""
@@ -54,19 +80,93 @@ def read_root():
 
 
 @app.post("/api/leads", response_model=schemas.LeadResponse, status_code=status.HTTP_201_CREATED)
-def create_lead(lead: schemas.LeadCreate, db: Session = Depends(get_db)):
+def create_lead(lead: schemas.LeadCreate, request: Request, response: Response, background_tasks: BackgroundTasks,
+                db: Session = Depends(get_write_db),
+                idempotency_key: Optional[str] = Header(None, alias=idempotency.HEADER)):
     """
     Create a new lead.
     
     Steps:
     1. Validate input
-    2. Check for fraud
-    3. Qualify with AI
-    4. Save to database
-    5. Send email if hot lead
+    2. Rate-limit per client IP
+    3. Check for fraud
+    4. Qualify with AI (or rule-based score when overloaded or out of time)
+    5. Save to database
+    6. Send email if hot lead
+    
+    The whole request runs against a deadline (X-Request-Timeout header,
+    capped by REQUEST_DEADLINE_SECONDS) and each stage gets what is left.
+    
+    With an Idempotency-Key header, a retry of the same submission returns the
+    original response (waiting for it if still in flight) instead of running
+    these steps again.
     """
     
+    if idempotency_key is None:
+        return _create_lead(lead, request, background_tasks, db)
+    
+    if not idempotency_key or len(idempotency_key) > idempotency.MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{idempotency.HEADER} must be 1-{idempotency.MAX_KEY_LENGTH} characters"
+        )
+    
+    fingerprint = idempotency.fingerprint(lead.model_dump())
+    try:
+        stored = idempotency.begin(idempotency_key, fingerprint)
+    except idempotency.KeyReused:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{idempotency.HEADER} was already used for a different lead"
+        )
+    except idempotency.StillInFlight:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The original request with this key is still being processed",
+            headers={"Retry-After": "1"}
+        )
+    
+    if stored is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+        return stored
+    
+    try:
+        db_lead = _create_lead(lead, request, background_tasks, db)
+    except Exception:
+        # Rejected or failed: let a retry run the pipeline again
+        idempotency.release(idempotency_key)
+        raise
+    
+    idempotency.complete(idempotency_key, fingerprint,
+                         schemas.LeadResponse.model_validate(db_lead).model_dump(mode='json'))
+    return db_lead
+
+
+def _create_lead(lead: schemas.LeadCreate, request: Request, background_tasks: BackgroundTasks, db: Session):
+    """Steps 2-6 of create_lead"""
+    
+    deadline = Deadline.from_request(request)
+    
+    # Per-IP sliding window over recent submissions
+    ip_address = admission.client_ip(request)
+    if ip_address and admission.RATE_LIMIT_PER_IP > 0:
+        recent = crud.count_recent_leads_from_ip(db, ip_address, admission.RATE_LIMIT_WINDOW)
+        if recent >= admission.RATE_LIMIT_PER_IP:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many submissions from this address, please try again later",
+                headers={"Retry-After": str(admission.RATE_LIMIT_WINDOW)}
+            )
+    
     # Check for fraud
+    try:
+        deadline.check("fraud check")
+    except DeadlineExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     fraud_check = detect_fraud(
         name=lead.name,
         email=lead.email,
@@ -80,20 +180,48 @@ def create_lead(lead: schemas.LeadCreate, db: Session = Depends(get_db)):
             detail=f"Submission flagged: {', '.join(fraud_check['signals'])}"
         )
     
-    # Qualify with AI
-    qualification = qualify_lead(lead.initial_message)
+    # Qualify with AI, unless too many LLM calls are already in flight.
+    # Queue wait and the LLM call share the budget left after the write reserve.
+    needs_requalification = False
+    try:
+        qualification = qualify_lead(lead.initial_message, timeout=deadline.budget(reserve=WRITE_RESERVE))
+        if is_fallback(qualification):
+            # LLM failed or ran out of budget: score by rules, requalify later
+            qualification = rule_scoring.score_lead(lead.initial_message)
+            needs_requalification = True
+    except admission.Overloaded as e:
+        if admission.MODE == "reject":
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again shortly",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        # Score by rules now; requalify.py --where "pending=true" picks it up later
+        qualification = rule_scoring.score_lead(lead.initial_message)
+        needs_requalification = True
     
     # Save to database
-    db_lead = crud.create_lead(
-        db=db,
-        lead=lead,
-        qualification=qualification,
-        fraud_check=fraud_check
-    )
+    try:
+        db_lead = crud.create_lead(
+            db=db,
+            lead=lead,
+            qualification=qualification,
+            fraud_check=fraud_check,
+            ip_address=ip_address,
+            needs_requalification=needs_requalification,
+            timeout=max(deadline.remaining(), MIN_WRITE_BUDGET)
+        )
+    except DeadlineExceeded as e:
+        # Group commit gave up before the row was written
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     
-    # Send email notification if hot lead
+    # Email (or queue for the digest) if hot lead; after the response if time is short
     if qualification['quality_score'] >= 70:
-        send_hot_lead_notification({
+        lead_data = {
             'name': lead.name,
             'email': lead.email,
             'phone': lead.phone,
@@ -102,36 +230,133 @@ def create_lead(lead: schemas.LeadCreate, db: Session = Depends(get_db)):
             'timeline': qualification['timeline'],
             'budget_range': qualification['budget_range'],
             'quality_score': qualification['quality_score']
-        })
+        }
+        if deadline.remaining() >= NOTIFY_BUDGET:
+            email_service.notify_hot_lead(lead_data)
+        else:
+            background_tasks.add_task(email_service.notify_hot_lead, lead_data)
     
     return db_lead
 
 
 @app.get("/api/leads", response_model=List[schemas.LeadResponse])
 def get_leads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     min_score: Optional[int] = None,
     max_score: Optional[int] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    signal: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all leads with optional filters"""
-    
-    leads = crud.get_leads(
-        db=db,
-        skip=skip,
-        limit=limit,
-        status=status,
-        min_score=min_score,
-        max_score=max_score
-    )
+    """Get all leads with optional filters; the next page's cursor is in X-Next-Cursor
+    
+    signal: only leads whose fraud check raised it (e.g. "Repeated digits")
+    """
+    
+    try:
+        leads = crud.get_leads(
+            db=db,
+            skip=skip,
+            limit=limit,
+            status=status,
+            min_score=min_score,
+            max_score=max_score,
+            cursor=cursor,
+            signal=signal,
+            created_after=created_after
+        )
+    except ValueError:
+        # `status` is a query parameter here, shadowing fastapi.status
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor"
+        )
+    
+    next_cursor = crud.next_cursor(leads, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return leads
 
 
+@app.get("/api/leads/changes", response_model=schemas.LeadChangesResponse)
+def get_lead_changes(since: Optional[str] = None, limit: int = 500, db: Session = Depends(get_db)):
+    """Leads created/updated and ids deleted since a token from a previous call"""
+    
+    try:
+        return crud.get_lead_changes(db=db, since=since, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid since token"
+        )
+
+
+@app.get("/api/leads/search", response_model=schemas.LeadSearchResponse)
+def search_leads(
+    q: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Full-text search over lead messages, names and emails, best matches first"""
+    
+    try:
+        return crud.search_leads(db=db, q=q, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@app.get("/api/leads/lookup", response_model=List[schemas.LeadLookupResult])
+def lookup_leads(q: str, limit: int = 10, db: Session = Depends(get_db)):
+    """Fuzzy lookup by partial or misspelled name, or partial phone number"""
+    
+    return crud.lookup_leads(db=db, q=q, limit=limit)
+
+
+@app.patch("/api/leads", response_model=List[schemas.LeadResponse])
+def bulk_update_leads(bulk_update: schemas.LeadBulkUpdate, db: Session = Depends(get_write_db)):
+    """Update status/assignment for a list of lead ids and/or every lead matching a filter"""
+    
+    if bulk_update.ids is None and bulk_update.filter is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids and/or filter"
+        )
+    
+    if bulk_update.filter is not None and not bulk_update.filter.dict(exclude_none=True):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filter needs at least one criterion; an empty filter would match every lead"
+        )
+    
+    if not bulk_update.dict(include={'status', 'assigned_to'}, exclude_unset=True):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nothing to update: set status and/or assigned_to"
+        )
+    
+    # Id lists are already capped by the schema; a filter can match anything
+    if bulk_update.ids is None:
+        matching = crud.count_bulk_update_targets(db=db, bulk_update=bulk_update)
+        if matching > crud.BULK_UPDATE_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Filter matches {matching} leads; at most {crud.BULK_UPDATE_MAX_ROWS} can be updated at once"
+            )
+    
+    return crud.bulk_update_leads(db=db, bulk_update=bulk_update)
+
+
 @app.get("/api/leads/{lead_id}", response_model=schemas.LeadResponse)
-def get_lead(lead_id: int, db: Session = Depends(get_db)):
+def get_lead(lead_id: int, db: Session = Depends(get_read_db)):
     """Get single lead by ID"""
     
     lead = crud.get_lead(db=db, lead_id=lead_id)
@@ -145,7 +370,7 @@ def get_lead(lead_id: int, db: Session = Depends(get_db)):
 
 
 @app.patch("/api/leads/{lead_id}", response_model=schemas.LeadResponse)
-def update_lead(lead_id: int, lead_update: schemas.LeadUpdate, db: Session = Depends(get_db)):
+def update_lead(lead_id: int, lead_update: schemas.LeadUpdate, db: Session = Depends(get_write_db)):
     """Update lead status/assignment"""
     
     lead = crud.update_lead(db=db, lead_id=lead_id, lead_update=lead_update)
@@ -158,13 +383,122 @@ def update_lead(lead_id: int, lead_update: schemas.LeadUpdate, db: Session = Dep
     return lead
 
 
+@app.get("/api/leads/{lead_id}/activities", response_model=List[schemas.LeadActivityResponse])
+def get_lead_activities(lead_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Get a lead's activity timeline, newest first"""
+    
+    return crud.get_lead_activities(db=db, lead_id=lead_id, skip=skip, limit=limit)
+
+
 @app.get("/api/stats")
-def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_read_db)):
     """Get dashboard statistics"""
     
     return crud.get_lead_stats(db=db)
 
 
+@app.get("/api/dashboard", response_model=schemas.DashboardResponse)
+def get_dashboard(
+    limit: int = 100,
+    status: Optional[str] = None,
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Stats plus one page of leads (filtered, or full-text search when q is set) in one response"""
+    
+    try:
+        if q:
+            page = crud.search_leads(db=db, q=q, limit=limit, cursor=cursor)
+            leads, next_cursor = page['results'], page['next_cursor']
+        else:
+            leads = crud.get_leads(
+                db=db,
+                limit=limit,
+                status=status,
+                min_score=min_score,
+                max_score=max_score,
+                cursor=cursor
+            )
+            next_cursor = crud.next_cursor(leads, limit)
+    except ValueError:
+        # `status` is a query parameter here, shadowing fastapi.status
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor"
+        )
+    
+    return {
+        'stats': crud.get_lead_stats(db=db),
+        'leads': leads,
+        'next_cursor': next_cursor
+    }
+
+
+@app.get("/api/analytics/daily", response_model=List[schemas.LeadDailyPoint])
+def get_daily_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    group_by: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Per-day lead counts and score tallies (UTC days, default the last 365), from the rollup table"""
+    
+    if group_by is not None and group_by not in crud.ROLLUP_GROUPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of: {', '.join(crud.ROLLUP_GROUPS)}"
+        )
+    
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=364)
+    
+    return crud.get_daily_rollups(db=db, start=start, end=end, group_by=group_by)
+
+
+@app.get("/api/events")
+def stream_events():
+    """Server-Sent Events: lead_created, lead_updated, stats_delta (and resync if events were dropped)"""
+    
+    return StreamingResponse(
+        events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """Cache backend and per-namespace hit ratios for this worker"""
+    
+    return cache.stats()
+
+
+@app.get("/api/admission/stats")
+def get_admission_stats():
+    """In-flight qualifications, queue wait and shed count for this worker"""
+    return admission.controller.stats()
+
+
+@app.get("/api/assignment/stats")
+def get_assignment_stats():
+    """Open-lead count per advisor as seen by this worker's auto-assignment pool"""
+    return {
+        "enabled": assignment.ENABLED,
+        "min_score": assignment.MIN_SCORE,
+        "advisors": assignment.pool.loads(),
+    }
+
+
+@app.get("/api/qualifier/stats")
+def get_qualifier_stats_endpoint():
+    """Local classifier vs LLM traffic split, agreement rates and LLM token usage"""
+    
+    return get_qualifier_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
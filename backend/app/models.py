@@ -1,10 +1,30 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Boolean, Text, JSON, Enum, Index, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from .database import Base
 
 
+# Allowed values for the categorical lead columns. Native enums on Postgres
+# (4 bytes, compared as integers); plain strings elsewhere. LLM output is
+# mapped onto these by app.services.normalize.
+LEAD_GOALS = ('investment', 'retirement', 'insurance', 'tax', 'wealth_management', 'unclear')
+LEAD_TIMELINES = ('immediate', '1-3_months', '6-12_months', '5+_years', 'unclear')
+LEAD_BUDGET_RANGES = ('<5L', '5-20L', '20-50L', '50L+', 'not_disclosed')
+LEAD_STATUSES = ('new', 'assigned', 'contacted', 'meeting_booked', 'closed', 'lost')
+LEAD_CLARITY = ('clear', 'vague', 'very_vague')
+LEAD_COMPLETENESS = ('all', 'partial', 'minimal')
+
+
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index('ix_leads_created_at_id', 'created_at', 'id'),
+        # Per-IP sliding-window rate limit on lead submission
+        Index('ix_leads_ip_address_created_at', 'ip_address', 'created_at'),
+        # Per-advisor open-lead counts that seed auto-assignment
+        Index('ix_leads_assigned_to_status', 'assigned_to', 'status'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -17,28 +37,170 @@ class Lead(Base):
     initial_message = Column(Text, nullable=False)
     
     # AI Qualification Results
-    goal = Column(String(50), index=True)  # investment, retirement, etc.
-    timeline = Column(String(50))
-    budget_range = Column(String(50))
-    quality_score = Column(Integer)
+    goal = Column(Enum(*LEAD_GOALS, name='lead_goal'), index=True)
+    timeline = Column(Enum(*LEAD_TIMELINES, name='lead_timeline'))
+    budget_range = Column(Enum(*LEAD_BUDGET_RANGES, name='lead_budget_range'))
+    clarity = Column(Enum(*LEAD_CLARITY, name='lead_clarity'))
+    completeness = Column(Enum(*LEAD_COMPLETENESS, name='lead_completeness'))
+    quality_score = Column(Integer)  # from the features above, see services/scoring.py
+    score_version = Column(Integer)  # weight table version quality_score was computed with
     
     # Fraud Detection
     is_fraud = Column(Boolean, default=False)
-    fraud_signals = Column(Text)  # JSON string of signals
+    fraud_signals = Column(JSON().with_variant(JSONB(), 'postgresql'))  # list of signal names
+    needs_requalification = Column(Boolean, default=False, server_default='false', index=True)  # scored by rules under load
     
     # Status & Assignment
-    status = Column(String(50), default='new', index=True)
+    status = Column(Enum(*LEAD_STATUSES, name='lead_status'), default='new', index=True)
     assigned_to = Column(String(255), nullable=True)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
     
     # Source tracking
     source = Column(String(100))  # web, referral, etc.
     ip_address = Column(String(45))
 
 
+# Signal filtering (fraud_signals @> '["Repeated digits"]') on Postgres
+event.listen(Lead.__table__, 'after_create', DDL(
+    "CREATE INDEX ix_leads_fraud_signals ON leads USING GIN (fraud_signals jsonb_path_ops)"
+).execute_if(dialect='postgresql'))
+
+
+# Full-text search over name/email/initial_message.
+# Postgres: stored tsvector column + GIN index (not mapped on the model, it is
+# only read by crud.search_leads). SQLite: external-content FTS5 table kept in
+# sync by triggers.
+LEADS_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(initial_message, '')), 'B')"
+)
+
+event.listen(Lead.__table__, 'after_create', DDL(
+    f"ALTER TABLE leads ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS ({LEADS_SEARCH_VECTOR_SQL}) STORED"
+).execute_if(dialect='postgresql'))
+event.listen(Lead.__table__, 'after_create', DDL(
+    "CREATE INDEX ix_leads_search_vector ON leads USING GIN (search_vector)"
+).execute_if(dialect='postgresql'))
+
+# Fuzzy lookup by partial/misspelled name or partial phone number.
+# Postgres: pg_trgm GIN indexes on name and on a digits-only phone column.
+# SQLite deployments use the in-process n-gram index in services/fuzzy_index.py.
+for _statement in [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE leads ADD COLUMN phone_digits varchar(20) "
+    "GENERATED ALWAYS AS (regexp_replace(phone, '\\D', '', 'g')) STORED",
+    "CREATE INDEX ix_leads_name_trgm ON leads USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX ix_leads_phone_digits_trgm ON leads USING GIN (phone_digits gin_trgm_ops)",
+]:
+    event.listen(Lead.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE leads_fts USING fts5("
+    "name, email, initial_message, content='leads', content_rowid='id')",
+    "CREATE TRIGGER leads_fts_ai AFTER INSERT ON leads BEGIN "
+    "INSERT INTO leads_fts(rowid, name, email, initial_message) "
+    "VALUES (new.id, new.name, new.email, new.initial_message); END",
+    "CREATE TRIGGER leads_fts_ad AFTER DELETE ON leads BEGIN "
+    "INSERT INTO leads_fts(leads_fts, rowid, name, email, initial_message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.initial_message); END",
+    "CREATE TRIGGER leads_fts_au AFTER UPDATE OF name, email, initial_message ON leads BEGIN "
+    "INSERT INTO leads_fts(leads_fts, rowid, name, email, initial_message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.initial_message); "
+    "INSERT INTO leads_fts(rowid, name, email, initial_message) "
+    "VALUES (new.id, new.name, new.email, new.initial_message); END",
+]
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(Lead.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+
+class LeadTombstone(Base):
+    """One row per deleted lead, written by a database trigger, for the change feed"""
+    __tablename__ = "lead_tombstones"
+    
+    id = Column(Integer, primary_key=True)
+    lead_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+# Record deletions however they happen (API, archive job, manual SQL).
+# The trigger lives on leads, so create that table first.
+LeadTombstone.__table__.add_is_dependent_on(Lead.__table__)
+event.listen(LeadTombstone.__table__, 'after_create', DDL(
+    "CREATE OR REPLACE FUNCTION record_lead_tombstone() RETURNS trigger AS $$ "
+    "BEGIN INSERT INTO lead_tombstones (lead_id, deleted_at) VALUES (OLD.id, now()); RETURN OLD; END "
+    "$$ LANGUAGE plpgsql"
+).execute_if(dialect='postgresql'))
+event.listen(LeadTombstone.__table__, 'after_create', DDL(
+    "CREATE TRIGGER leads_tombstone AFTER DELETE ON leads "
+    "FOR EACH ROW EXECUTE FUNCTION record_lead_tombstone()"
+).execute_if(dialect='postgresql'))
+event.listen(LeadTombstone.__table__, 'after_create', DDL(
+    "CREATE TRIGGER leads_tombstone AFTER DELETE ON leads BEGIN "
+    "INSERT INTO lead_tombstones (lead_id, deleted_at) VALUES (old.id, CURRENT_TIMESTAMP); END"
+).execute_if(dialect='sqlite'))
+
+
+class LeadArchive(Base):
+    """A monthly leads partition exported to Parquet and detached (see archive_leads.py)"""
+    __tablename__ = "lead_archives"
+    __table_args__ = (
+        # Read-through: which archive file could hold a given lead id
+        Index('ix_lead_archives_min_id_max_id', 'min_id', 'max_id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    partition_name = Column(String(63), unique=True, nullable=False)
+    range_start = Column(DateTime(timezone=True), nullable=False)
+    range_end = Column(DateTime(timezone=True), nullable=False)
+    min_id = Column(Integer, nullable=False)
+    max_id = Column(Integer, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    path = Column(Text, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class LeadDailyRollup(Base):
+    """Per-day lead counts and score tallies for time-series charts.
+    
+    Kept current by app.services.rollups on every write and rebuilt for
+    recent days by reconcile_rollups.py. Days are UTC; missing source/goal is
+    stored as 'unknown'.
+    """
+    __tablename__ = "lead_daily_rollups"
+    
+    day = Column(Date, primary_key=True)
+    source = Column(String(100), primary_key=True)
+    goal = Column(String(50), primary_key=True)
+    status_bucket = Column(String(20), primary_key=True)  # open, in_progress, closed, lost
+    lead_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    hot = Column(Integer, nullable=False, default=0)
+    warm = Column(Integer, nullable=False, default=0)
+    cold = Column(Integer, nullable=False, default=0)
+    fraud = Column(Integer, nullable=False, default=0)
+
+
+class LeadRollupFence(Base):
+    """Day range rebuilt by reconcile_daily_rollups, and when.
+    
+    Buffered rollup deltas for lead changes before ``fenced_at`` are already in
+    the rebuilt rows, so app.services.rollups drops them instead of adding them
+    twice. Fences older than a day are pruned by the next rebuild.
+    """
+    __tablename__ = "lead_rollup_fences"
+    
+    id = Column(Integer, primary_key=True)
+    day_from = Column(Date, nullable=False)
+    day_to = Column(Date, nullable=False)
+    fenced_at = Column(DateTime(timezone=True), nullable=False)
+
+
 class User(Base):
     __tablename__ = "users"
     
@@ -53,9 +215,13 @@ class User(Base):
 
 class LeadActivity(Base):
     __tablename__ = "lead_activities"
+    __table_args__ = (
+        # Serves the per-lead timeline query; also covers lookups by lead_id alone
+        Index('ix_lead_activities_lead_id_created_at', 'lead_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, nullable=False, index=True)
+    lead_id = Column(Integer, nullable=False)
     activity_type = Column(String(50))  # created, assigned, contacted, meeting_booked, closed
     description = Column(Text)
     created_by = Column(String(255))
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, EmailStr, Field
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Literal, Optional
+
+from .models import LEAD_STATUSES
+
+LeadStatus = Literal[LEAD_STATUSES]
 
 
 class LeadCreate(BaseModel):
@@ -20,6 +24,8 @@ class LeadResponse(BaseModel):
     goal: Optional[str]
     timeline: Optional[str]
     budget_range: Optional[str]
+    clarity: Optional[str] = None
+    completeness: Optional[str] = None
     quality_score: Optional[int]
     is_fraud: bool
     status: str
@@ -29,6 +35,32 @@ class LeadResponse(BaseModel):
         from_attributes = True
 
 
+class LeadSearchResult(LeadResponse):
+    rank: float
+
+
+class LeadSearchResponse(BaseModel):
+    results: List[LeadSearchResult]
+    next_cursor: Optional[str]
+
+
+class LeadLookupResult(LeadResponse):
+    score: float
+
+
+class DashboardResponse(BaseModel):
+    stats: dict
+    leads: List[LeadResponse]
+    next_cursor: Optional[str]
+
+
+class LeadChangesResponse(BaseModel):
+    changes: List[LeadResponse]
+    deleted_ids: List[int]
+    next_token: str
+    has_more: bool
+
+
 class LeadQualification(BaseModel):
     goal: str
     timeline: str
@@ -42,5 +74,43 @@ class FraudCheck(BaseModel):
 
 
 class LeadUpdate(BaseModel):
+    status: Optional[LeadStatus] = None
+    assigned_to: Optional[str] = None
+
+
+class LeadFilter(BaseModel):
     status: Optional[str] = None
-    assigned_to: Optional[str] = None
\ No newline at end of file
+    min_score: Optional[int] = None
+    max_score: Optional[int] = None
+    signal: Optional[str] = None
+    created_after: Optional[datetime] = None
+
+
+class LeadBulkUpdate(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=10000)  # crud.BULK_UPDATE_MAX_ROWS
+    filter: Optional[LeadFilter] = None
+    status: Optional[LeadStatus] = None
+    assigned_to: Optional[str] = None
+
+
+class LeadActivityResponse(BaseModel):
+    id: int
+    lead_id: int
+    activity_type: Optional[str]
+    description: Optional[str]
+    created_by: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class LeadDailyPoint(BaseModel):
+    day: date
+    group: Optional[str] = None
+    leads: int
+    avg_score: Optional[float] = None
+    hot: int
+    warm: int
+    cold: int
+    fraud: int
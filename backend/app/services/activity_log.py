@@ -0,0 +1,90 @@
+"""Buffered, batched writer for lead activity rows.
+
+Request handlers call ``record_activity`` which only appends to an in-memory
+queue; a background thread drains the queue and writes each batch with a
+single multi-row INSERT, so logging adds no database round-trip to the request.
+"""
+
+import atexit
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from ..database import SessionLocal
+from .. import models
+
+FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "0.5"))
+BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+
+_queue: "queue.Queue[dict]" = queue.Queue()
+_flush_lock = threading.Lock()
+_stop = threading.Event()
+_worker = None
+
+
+def record_activity(lead_id: int, activity_type: str, description: str = None,
+                    created_by: str = "system") -> None:
+    """Queue an activity row; it is written on the next flush."""
+
+    _queue.put({
+        "lead_id": lead_id,
+        "activity_type": activity_type,
+        "description": description,
+        "created_by": created_by,
+        # Stamp now rather than at flush time so the timeline order is exact
+        "created_at": datetime.now(timezone.utc),
+    })
+    _ensure_worker()
+
+
+def flush() -> int:
+    """Write everything queued so far; returns the number of rows written."""
+
+    written = 0
+    with _flush_lock:
+        while True:
+            batch = []
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not batch:
+                return written
+
+            db = SessionLocal()
+            try:
+                db.execute(insert(models.LeadActivity), batch)
+                db.commit()
+                written += len(batch)
+            except Exception as e:
+                db.rollback()
+                print(f"Activity log flush error ({len(batch)} rows dropped): {e}")
+            finally:
+                db.close()
+
+
+def _run() -> None:
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run, name="activity-log", daemon=True)
+        _worker.start()
+
+
+def shutdown() -> None:
+    """Stop the background thread and write any remaining rows."""
+
+    _stop.set()
+    flush()
+
+
+atexit.register(shutdown)
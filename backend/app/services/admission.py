@@ -0,0 +1,123 @@
+"""Admission control for LLM lead qualification.
+
+At most ADMISSION_MAX_INFLIGHT LLM qualifications run at once per worker
+(cache hits and confident local predictions skip admission). A
+request waits up to ADMISSION_MAX_WAIT seconds for a slot, and requests are
+turned away immediately once ADMISSION_MAX_QUEUE are already waiting. An
+overloaded request is either rejected (503 + Retry-After) or degraded to the
+rule-based score, depending on ADMISSION_MODE.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "16"))
+MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "5"))
+MODE = os.getenv("ADMISSION_MODE", "degrade")  # degrade | reject
+
+# Per-IP sliding window on POST /api/leads; 0 (default) disables it. Only enable
+# with TRUST_PROXY_HEADERS (and TRUSTED_PROXY_HOPS) set, so the limit sees the
+# X-Forwarded-For the Streamlit frontend sends; otherwise every public
+# submission shares the frontend server's IP.
+RATE_LIMIT_PER_IP = int(os.getenv("RATE_LIMIT_PER_IP", "0"))
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "600"))
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: int = MAX_INFLIGHT, max_queue: int = MAX_QUEUE, max_wait: float = MAX_WAIT):
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.waiting = 0
+        self.avg_wait = 0.0
+        self.avg_service = 1.0
+        self.admitted = 0
+        self.shed = 0
+
+    def retry_after(self) -> int:
+        """Rough time until a slot frees up, for the Retry-After header."""
+        return max(1, round(self.avg_service * (1 + self.waiting / max(1, self.inflight))))
+
+    @contextmanager
+    def admit(self, timeout: float = None):
+        """Hold a qualification slot for the duration of the block, or raise Overloaded.
+
+        Waits at most ``max_wait`` seconds, or ``timeout`` if that is shorter.
+        """
+
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                raise Overloaded(self.retry_after())
+            self.waiting += 1
+
+        start = time.monotonic()
+        wait = self.max_wait if timeout is None else min(self.max_wait, timeout)
+        acquired = self.slots.acquire(timeout=wait) if wait > 0 else self.slots.acquire(blocking=False)
+        waited = time.monotonic() - start
+
+        with self.lock:
+            self.waiting -= 1
+            self.avg_wait = 0.9 * self.avg_wait + 0.1 * waited
+            if not acquired:
+                self.shed += 1
+                raise Overloaded(self.retry_after())
+            self.inflight += 1
+            self.admitted += 1
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            service = time.monotonic() - started
+            with self.lock:
+                self.inflight -= 1
+                self.avg_service = 0.9 * self.avg_service + 0.1 * service
+            self.slots.release()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "mode": MODE,
+                "inflight": self.inflight,
+                "waiting": self.waiting,
+                "avg_queue_wait_ms": round(self.avg_wait * 1000, 1),
+                "avg_qualify_ms": round(self.avg_service * 1000, 1),
+                "admitted": self.admitted,
+                "shed": self.shed,
+            }
+
+
+controller = AdmissionController()
+
+
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+# How many trusted proxies append to X-Forwarded-For before the API (the Streamlit
+# frontend counts as one, plus any load balancer in front of it)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+
+def client_ip(request) -> str:
+    """Submitting client's IP; honours X-Forwarded-For only behind a trusted proxy.
+
+    Entries left of the ones our proxies appended are whatever the client sent,
+    so the address is read TRUSTED_PROXY_HOPS entries from the right.
+    """
+
+    forwarded = request.headers.get("x-forwarded-for") if TRUST_PROXY_HEADERS else None
+    if forwarded:
+        hops = [entry.strip() for entry in forwarded.split(",") if entry.strip()]
+        if TRUSTED_PROXY_HOPS > 0 and len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS][:45]
+    return request.client.host if request.client else None
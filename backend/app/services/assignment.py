@@ -0,0 +1,83 @@
+"""Least-loaded auto-assignment of new hot and warm leads to advisors.
+
+Each worker keeps every active advisor's open-lead count in a min-heap. The
+heap is seeded from one aggregate query and re-seeded every RESEED_INTERVAL
+seconds, which also picks up advisor changes and other workers' assignments.
+Picking an advisor is a heap pop/push (O(log n)) with no per-lead COUNT query.
+Count changes push a fresh heap entry; outdated entries are skipped when they
+reach the top.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Optional
+
+# Opt-in: when on, new leads scoring MIN_SCORE+ are created already assigned (status "assigned")
+ENABLED = os.getenv("AUTO_ASSIGN", "false").lower() in ("1", "true", "yes")
+MIN_SCORE = int(os.getenv("AUTO_ASSIGN_MIN_SCORE", "40"))  # warm and hot leads
+RESEED_INTERVAL = float(os.getenv("AUTO_ASSIGN_RESEED_INTERVAL", "300"))
+
+# Statuses that count towards an advisor's load
+OPEN_STATUSES = ('new', 'assigned', 'contacted', 'meeting_booked')
+
+
+class AdvisorPool:
+    """Open-lead counts per advisor with least-loaded selection."""
+
+    def __init__(self):
+        self._loads: dict = {}
+        self._heap: list = []
+        # Tie-break: among equally loaded advisors, the one touched longest ago wins
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._seeded_at = None
+
+    def stale(self) -> bool:
+        return self._seeded_at is None or time.monotonic() - self._seeded_at >= RESEED_INTERVAL
+
+    def seed(self, loads: dict) -> None:
+        """Replace all counts with ``{advisor: open leads}``."""
+
+        with self._lock:
+            self._loads = dict(loads)
+            self._heap = [(load, next(self._order), advisor) for advisor, load in self._loads.items()]
+            heapq.heapify(self._heap)
+            self._seeded_at = time.monotonic()
+
+    def take(self) -> Optional[str]:
+        """Least-loaded advisor, counted as having one more open lead; None if there are none."""
+
+        with self._lock:
+            while self._heap:
+                load, _, advisor = self._heap[0]
+                if self._loads.get(advisor) != load:
+                    heapq.heappop(self._heap)
+                    continue
+                self._loads[advisor] = load + 1
+                heapq.heapreplace(self._heap, (load + 1, next(self._order), advisor))
+                return advisor
+            return None
+
+    def adjust(self, advisor: str, delta: int) -> None:
+        """Change one advisor's count; advisors outside the pool are ignored."""
+
+        with self._lock:
+            if advisor not in self._loads:
+                return
+            self._loads[advisor] = max(0, self._loads[advisor] + delta)
+            heapq.heappush(self._heap, (self._loads[advisor], next(self._order), advisor))
+
+            # Keep outdated entries from piling up between re-seeds
+            if len(self._heap) > 4 * len(self._loads) + 64:
+                self._heap = [(load, next(self._order), name) for name, load in self._loads.items()]
+                heapq.heapify(self._heap)
+
+    def loads(self) -> dict:
+        with self._lock:
+            return dict(sorted(self._loads.items(), key=lambda item: (item[1], item[0])))
+
+
+pool = AdvisorPool()
@@ -0,0 +1,280 @@
+"""Shared cache with in-process LRU, SQLite-file and Redis backends.
+
+Pick the backend with CACHE_URL:
+    memory://                 per-process LRU (default; fine for one worker and tests)
+    sqlite:///tmp/cache.db    file shared by every worker on one host
+    redis://host:6379/0       shared across hosts (needs the ``redis`` package)
+
+Values must be JSON-serialisable. Keys live in namespaces; ``invalidate(ns)``
+bumps the namespace version stored in the backend itself, so every worker
+stops seeing the old entries within CACHE_VERSION_TTL seconds (each process
+re-reads a namespace's version at most that often). With memory:// that only covers the
+calling process, so maintenance scripts need the API's shared CACHE_URL.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+CACHE_URL = os.getenv("CACHE_URL", "memory://")
+MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+# How long a process trusts its copy of a namespace version before re-reading it
+VERSION_TTL = float(os.getenv("CACHE_VERSION_TTL", "1"))
+# Seconds between sweeps of expired rows from the SQLite cache file
+SQLITE_PURGE_INTERVAL = float(os.getenv("CACHE_PURGE_INTERVAL", "60"))
+
+
+class MemoryBackend:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.time():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        with self.lock:
+            self.data[key] = (time.time() + ttl if ttl else 0, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    def add(self, key: str, value: str, ttl: Optional[float]) -> bool:
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None and not (entry[0] and entry[0] < time.time()):
+                return False
+            self.data[key] = (time.time() + ttl if ttl else 0, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self.lock:
+            value = int(self.data.get(key, (0, "0"))[1]) + 1
+            self.data[key] = (0, str(value))
+            return value
+
+
+class SQLiteBackend:
+    """Cache table in a local SQLite file, shared by workers on one host."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self.lock = threading.Lock()
+        self.purged_at = time.time()
+
+    def _purge_expired(self, now: float) -> None:
+        """Delete expired rows now and then; caller holds the lock.
+
+        Every entry has a TTL, so this also clears rows orphaned by invalidate().
+        """
+
+        if now - self.purged_at < SQLITE_PURGE_INTERVAL:
+            return
+        self.purged_at = now
+        self.conn.execute("DELETE FROM cache WHERE expires_at != 0 AND expires_at < ?", (now,))
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        now = time.time()
+        with self.lock:
+            self._purge_expired(now)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl if ttl else 0),
+            )
+
+    def add(self, key: str, value: str, ttl: Optional[float]) -> bool:
+        now = time.time()
+        with self.lock:
+            self._purge_expired(now)
+            # Takes over an expired row; a live one is left alone
+            cursor = self.conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE cache.expires_at != 0 AND cache.expires_at <= ?",
+                (key, value, now + ttl if ttl else 0, now),
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def incr(self, key: str) -> int:
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, '1', 0) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                (key,),
+            )
+            return int(self.conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()[0])
+
+
+class RedisBackend:
+    """Any Redis-protocol server (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_URL is a redis:// URL but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        self.client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key: str, value: str, ttl: Optional[float]) -> bool:
+        return bool(self.client.set(key, value, px=int(ttl * 1000) if ttl else None, nx=True))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+
+def _backend_from_url(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend()
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(parsed.path or ":memory:")
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {parsed.scheme}")
+
+
+class Cache:
+    """Namespaced JSON cache with TTLs and per-namespace hit/miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        # namespace -> (version, monotonic time it was read); saves a backend read per call
+        self.versions: dict = {}
+
+    def _key(self, namespace: str, key: Any) -> str:
+        version, read_at = self.versions.get(namespace, (None, 0.0))
+        now = time.monotonic()
+        if version is None or now - read_at >= VERSION_TTL:
+            version = self.backend.get(f"ns:{namespace}") or "0"
+            self.versions[namespace] = (version, now)
+        return f"{namespace}:{version}:{key}"
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        try:
+            raw = self.backend.get(self._key(namespace, key))
+        except Exception as e:
+            print(f"Cache get error: {e}")
+            raw = None
+
+        if raw is None:
+            self.misses[namespace] += 1
+            return None
+
+        self.hits[namespace] += 1
+        return json.loads(raw)
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            self.backend.set(self._key(namespace, key), json.dumps(value, default=str), ttl)
+        except Exception as e:
+            print(f"Cache set error: {e}")
+
+    def add(self, namespace: str, key: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set only if the key is absent or expired; True if this call stored it.
+
+        If the backend is unreachable this returns True, so callers carry on
+        as if they were first rather than failing.
+        """
+
+        try:
+            return self.backend.add(self._key(namespace, key), json.dumps(value, default=str), ttl)
+        except Exception as e:
+            print(f"Cache add error: {e}")
+            return True
+
+    def delete(self, namespace: str, key: Any) -> None:
+        try:
+            self.backend.delete(self._key(namespace, key))
+        except Exception as e:
+            print(f"Cache delete error: {e}")
+
+    @property
+    def shared(self) -> bool:
+        """False for memory://, where invalidate() never reaches other processes."""
+        return not isinstance(self.backend, MemoryBackend)
+
+    def invalidate(self, namespace: str) -> None:
+        """Drop every entry in a namespace (for all workers sharing the backend)."""
+
+        try:
+            version = self.backend.incr(f"ns:{namespace}")
+        except Exception as e:
+            print(f"Cache invalidate error: {e}")
+            return
+        # This process switches at once; others within VERSION_TTL
+        self.versions[namespace] = (str(version), time.monotonic())
+
+    def stats(self) -> dict:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        result = {}
+        for ns in namespaces:
+            total = self.hits[ns] + self.misses[ns]
+            result[ns] = {
+                "hits": self.hits[ns],
+                "misses": self.misses[ns],
+                "hit_ratio": round(self.hits[ns] / total, 3) if total else None,
+            }
+        return {"backend": type(self.backend).__name__, "namespaces": result}
+
+
+cache = Cache(_backend_from_url(CACHE_URL))
+
+
+def warn_if_not_shared() -> None:
+    """For scripts that change leads: say so if API workers won't see their invalidations."""
+
+    if not cache.shared:
+        print("⚠️  CACHE_URL is memory://, so the API's cached leads and stats were not cleared;\n"
+              "   they expire on their own TTLs. Run with the API's shared CACHE_URL (sqlite:// or redis://).")
+
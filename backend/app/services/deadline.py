@@ -0,0 +1,62 @@
+"""Per-request deadline budget for POST /api/leads.
+
+The budget starts when the request arrives and comes from the
+``X-Request-Timeout`` header (seconds), capped by REQUEST_DEADLINE_SECONDS.
+Each stage asks for what is left, minus time reserved for the stages after it,
+so a slow LLM call cannot eat the time needed to save the lead.
+"""
+
+import os
+import time
+
+# Default and upper bound; the frontend gives up after 30s
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE_SECONDS", "25"))
+HEADER = "X-Request-Timeout"
+
+# Time held back for the DB write and response after qualification
+WRITE_RESERVE = float(os.getenv("DEADLINE_WRITE_RESERVE_SECONDS", "2"))
+
+# The write always gets at least this long: dropping a qualified lead is worse
+# than answering slightly late
+MIN_WRITE_BUDGET = float(os.getenv("DEADLINE_MIN_WRITE_SECONDS", "2"))
+
+# Below this, hot lead emails are sent after the response instead of inline
+NOTIFY_BUDGET = float(os.getenv("DEADLINE_NOTIFY_SECONDS", "3"))
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_request(cls, request) -> "Deadline":
+        seconds = REQUEST_DEADLINE
+        header = request.headers.get(HEADER)
+        if header:
+            try:
+                seconds = min(max(float(header), 0.0), REQUEST_DEADLINE)
+            except ValueError:
+                pass
+        return cls(seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, reserve: float = 0.0, cap: float = None) -> float:
+        """Seconds a stage may spend, leaving ``reserve`` for later stages (0 if none left)."""
+
+        budget = max(0.0, self.remaining() - reserve)
+        return min(budget, cap) if cap is not None else budget
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"Request deadline of {self.seconds:g}s exceeded before {stage}")
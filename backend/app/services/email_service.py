@@ -1,16 +1,69 @@
-import resend
+"""Hot-lead notification emails.
+
+In the default ``immediate`` mode every hot lead sends its own email. In
+``digest`` mode hot leads are queued and a background thread sends one summary
+email per window: a window closes DIGEST_FLUSH_INTERVAL seconds after its first
+lead or as soon as it holds DIGEST_MAX_BATCH leads, whichever comes first.
+Leads scoring URGENT_SCORE or more are always sent straight away.
+"""
+
+import atexit
+import html
 import os
+import threading
+import time
+from string import Template
+
+import resend
 from dotenv import load_dotenv
 
 load_dotenv()
 
 resend.api_key = os.getenv('RESEND_API_KEY')
 
+HOT_SCORE = 70
+NOTIFY_MODE = os.getenv('NOTIFY_MODE', 'immediate').lower()  # immediate | digest
+DIGEST_FLUSH_INTERVAL = float(os.getenv('DIGEST_FLUSH_INTERVAL', '300'))
+DIGEST_MAX_BATCH = int(os.getenv('DIGEST_MAX_BATCH', '50'))
+URGENT_SCORE = int(os.getenv('URGENT_SCORE', '90'))
+
+# Parsed once at import; each digest only substitutes values
+_DIGEST_ROW = Template("""
+                    <tr>
+                        <td style="padding: 6px; color: #059669;"><strong>$quality_score</strong></td>
+                        <td style="padding: 6px;">$name<br><small>$email · $phone</small></td>
+                        <td style="padding: 6px;">$goal / $timeline / $budget_range</td>
+                        <td style="padding: 6px;"><small>$message</small></td>
+                    </tr>""")
+_DIGEST_EMAIL = Template("""
+            <html>
+            <body style="font-family: Arial, sans-serif;">
+                <div style="max-width: 800px; margin: 0 auto;">
+                    <div style="background: #2563eb; color: white; padding: 20px; border-radius: 8px;">
+                        <h1>🔥 $count New Hot Lead$plural</h1>
+                        <p>$window</p>
+                    </div>
+                    <table style="background: #f9fafb; width: 100%; margin-top: 10px; border-collapse: collapse;">
+                    <tr style="text-align: left;"><th>Score</th><th>Contact</th><th>Goal / Timeline / Budget</th><th>Message</th></tr>$rows
+                    </table>
+                </div>
+            </body>
+            </html>
+            """)
+
+_pending: list = []
+_window_opened = 0.0
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_wake = threading.Event()
+_stop = threading.Event()
+_worker = None
+
 
 def send_hot_lead_notification(lead_data: dict) -> bool:
     """Send email for hot leads"""
     
-    if lead_data['quality_score'] < 70:
+    if lead_data['quality_score'] < HOT_SCORE:
         return False
     
     try:
@@ -49,4 +102,106 @@ def send_hot_lead_notification(lead_data: dict) -> bool:
         
     except Exception as e:
         print(f"Email error: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def notify_hot_lead(lead_data: dict) -> bool:
+    """Email a hot lead now, or queue it for the next digest; False if not hot"""
+
+    if lead_data['quality_score'] < HOT_SCORE:
+        return False
+    if NOTIFY_MODE != 'digest' or lead_data['quality_score'] >= URGENT_SCORE:
+        return send_hot_lead_notification(lead_data)
+
+    global _window_opened
+    with _lock:
+        if not _pending:
+            _window_opened = time.monotonic()
+        _pending.append(lead_data)
+        # Wake the worker to start the window timer, or to send a full batch
+        wake = len(_pending) == 1 or len(_pending) >= DIGEST_MAX_BATCH
+    _ensure_worker()
+    if wake:
+        _wake.set()
+    return True
+
+
+def render_digest(leads: list) -> str:
+    rows = "".join(
+        _DIGEST_ROW.substitute({key: html.escape(str(value)) for key, value in lead.items()})
+        for lead in sorted(leads, key=lambda lead: -lead['quality_score'])
+    )
+    window = f"Collected over the last {DIGEST_FLUSH_INTERVAL:g}s (max {DIGEST_MAX_BATCH} per email)"
+    return _DIGEST_EMAIL.substitute(count=len(leads), plural='s' if len(leads) > 1 else '', window=window, rows=rows)
+
+
+def flush_digest(full_only: bool = False) -> int:
+    """Send queued leads, DIGEST_MAX_BATCH per email; returns emails sent.
+
+    With ``full_only`` only complete batches go out and the remainder starts a
+    new window.
+    """
+
+    global _window_opened
+    sent = 0
+    with _flush_lock:
+        while True:
+            with _lock:
+                if full_only and len(_pending) < DIGEST_MAX_BATCH:
+                    if _pending:
+                        _window_opened = time.monotonic()
+                    return sent
+                batch = _pending[:DIGEST_MAX_BATCH]
+                del _pending[:DIGEST_MAX_BATCH]
+
+            if not batch:
+                return sent
+
+            try:
+                top = max(lead['quality_score'] for lead in batch)
+                email = resend.Emails.send({
+                    "from": "leads@resend.dev",
+                    "to": [os.getenv('NOTIFICATION_EMAIL')],
+                    "subject": f"🔥 {len(batch)} Hot Lead{'s' if len(batch) > 1 else ''} (top score: {top})",
+                    "html": render_digest(batch),
+                })
+                print(f"Digest email sent ({len(batch)} leads): {email}")
+                sent += 1
+            except Exception as e:
+                print(f"Digest email error ({len(batch)} leads not sent): {e}")
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        with _lock:
+            timeout = _window_opened + DIGEST_FLUSH_INTERVAL - time.monotonic() if _pending else None
+        _wake.wait(None if timeout is None else max(timeout, 0))
+        _wake.clear()
+
+        with _lock:
+            expired = _pending and time.monotonic() - _window_opened >= DIGEST_FLUSH_INTERVAL
+            full = len(_pending) >= DIGEST_MAX_BATCH
+        if _stop.is_set():
+            break
+        if expired:
+            flush_digest()
+        elif full:
+            flush_digest(full_only=True)
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run, name="hot-lead-digest", daemon=True)
+        _worker.start()
+
+
+def shutdown() -> None:
+    """Stop the digest thread and send whatever is still queued."""
+
+    _stop.set()
+    _wake.set()
+    flush_digest()
+
+
+atexit.register(shutdown)
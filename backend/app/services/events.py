@@ -0,0 +1,94 @@
+"""In-process fan-out of lead events to Server-Sent Events subscribers.
+
+Writers call ``publish`` from any thread and never block: each subscriber has
+a bounded queue, and when a slow client's queue is full its oldest event is
+dropped and it is told to resync instead of holding up the writer.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+
+QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+KEEPALIVE_SECONDS = 15
+
+_ids = itertools.count(1)
+_subscribers: set["Subscriber"] = set()
+_lock = threading.Lock()
+
+
+class Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        """Runs on the subscriber's loop; drops the oldest event when full."""
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+def publish(event_type: str, data: dict) -> None:
+    """Send an event to every connected subscriber."""
+
+    event = {"id": next(_ids), "type": event_type, "data": data}
+    with _lock:
+        subscribers = list(_subscribers)
+
+    for subscriber in subscribers:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+        except RuntimeError:
+            # Loop already closed; the subscriber is going away
+            pass
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+async def stream():
+    """Async generator of SSE-formatted messages for one client."""
+
+    subscriber = Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _subscribers.add(subscriber)
+
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if subscriber.dropped:
+                # Events were lost; the client should refetch instead of patching
+                subscriber.dropped = 0
+                yield "event: resync\ndata: {}\n\n"
+
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+    finally:
+        with _lock:
+            _subscribers.discard(subscriber)
+
+
+def stats_delta(quality_score, is_fraud) -> dict:
+    """How one new lead changes the /api/stats counters."""
+
+    delta = {"total": 1, "hot": 0, "warm": 0, "cold": 0, "fraud": 1 if is_fraud else 0}
+    if quality_score is not None:
+        if quality_score >= 70:
+            delta["hot"] = 1
+        elif quality_score >= 40:
+            delta["warm"] = 1
+        else:
+            delta["cold"] = 1
+    return delta
@@ -0,0 +1,155 @@
+"""In-process trigram index for fuzzy name / phone lookup on SQLite.
+
+Postgres deployments use pg_trgm instead (see ``crud.lookup_leads``). This
+index mirrors ``word_similarity``: the share of the query's trigrams that
+appear in the candidate. It is built from the leads table on first use and
+kept current as leads are created. Every process holds its own copy, so before
+a lookup ``crud.lookup_leads`` also replays the lead change feed since the last
+refresh (at most every LOOKUP_INDEX_REFRESH seconds). That picks up other
+workers' new leads, renames and deletions.
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from .. import models
+
+REFRESH_INTERVAL = float(os.getenv("LOOKUP_INDEX_REFRESH", "2"))
+
+_lock = threading.Lock()
+_built = False
+# Change-feed position the index is current to, and when it was last advanced
+_token: Optional[str] = None
+_refreshed_at = 0.0
+_name_index: dict[str, set[int]] = defaultdict(set)
+_phone_index: dict[str, set[int]] = defaultdict(set)
+_names: dict[int, str] = {}
+_phones: dict[int, str] = {}
+
+
+def normalize_phone(phone: str) -> str:
+    return re.sub(r"\D", "", phone or "")
+
+
+def name_trigrams(text: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+
+    grams = set()
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def digit_trigrams(digits: str) -> set[str]:
+    return {digits[i:i + 3] for i in range(len(digits) - 2)}
+
+
+def _add(lead_id: int, name: str, phone: str) -> None:
+    digits = normalize_phone(phone)
+    _names[lead_id] = name
+    _phones[lead_id] = digits
+    for gram in name_trigrams(name):
+        _name_index[gram].add(lead_id)
+    for gram in digit_trigrams(digits):
+        _phone_index[gram].add(lead_id)
+
+
+def _remove(lead_id: int) -> None:
+    name = _names.pop(lead_id, None)
+    digits = _phones.pop(lead_id, None)
+    if name is not None:
+        for gram in name_trigrams(name):
+            _name_index[gram].discard(lead_id)
+    if digits is not None:
+        for gram in digit_trigrams(digits):
+            _phone_index[gram].discard(lead_id)
+
+
+def build(db, token: str) -> None:
+    """Load every lead's name and phone into the index (once per process).
+
+    ``token`` is a change-feed position taken before the load; refreshes start there.
+    """
+
+    global _built, _token, _refreshed_at
+    with _lock:
+        if _built:
+            return
+        for lead_id, name, phone in db.query(models.Lead.id, models.Lead.name, models.Lead.phone).yield_per(10000):
+            _add(lead_id, name, phone)
+        _token, _refreshed_at = token, time.monotonic()
+        _built = True
+
+
+def is_built() -> bool:
+    return _built
+
+
+def claim_refresh() -> Optional[str]:
+    """Change-feed token to catch up from, if a refresh is due and no other thread took it."""
+
+    global _refreshed_at
+    with _lock:
+        now = time.monotonic()
+        if not _built or now - _refreshed_at < REFRESH_INTERVAL:
+            return None
+        _refreshed_at = now
+        return _token
+
+
+def apply_changes(changes, deleted_ids, token: str) -> None:
+    """Re-index changed leads, drop deleted ones and move to ``token``."""
+
+    global _token
+    with _lock:
+        for lead in changes:
+            _remove(lead.id)
+            _add(lead.id, lead.name, lead.phone)
+        for lead_id in deleted_ids:
+            _remove(lead_id)
+        _token = token
+
+
+def add_lead(lead_id: int, name: str, phone: str) -> None:
+    """Index a newly created lead; no-op until the index has been built."""
+
+    with _lock:
+        if _built:
+            _add(lead_id, name, phone)
+
+
+def lookup_name(query: str, limit: int = 10, threshold: float = 0.3) -> list[tuple[int, float]]:
+    """Top-k (lead_id, score) by share of query trigrams found in the name."""
+
+    grams = name_trigrams(query)
+    if not grams:
+        return []
+
+    hits: dict[int, int] = defaultdict(int)
+    with _lock:
+        for gram in grams:
+            for lead_id in _name_index.get(gram, ()):
+                hits[lead_id] += 1
+
+    scored = ((lead_id, count / len(grams)) for lead_id, count in hits.items())
+    return heapq.nlargest(limit, (s for s in scored if s[1] >= threshold), key=lambda s: (s[1], s[0]))
+
+
+def lookup_phone(digits: str, limit: int = 10) -> list[tuple[int, float]]:
+    """Leads whose phone contains ``digits``, newest first."""
+
+    grams = digit_trigrams(digits)
+    with _lock:
+        if grams:
+            candidates = set.intersection(*(_phone_index.get(g, set()) for g in grams))
+        else:
+            candidates = set(_phones)
+        matches = [lead_id for lead_id in candidates if digits in _phones.get(lead_id, "")]
+
+    return [(lead_id, 1.0) for lead_id in heapq.nlargest(limit, matches)]
@@ -2,9 +2,13 @@
 
 import json
 import os
+import threading
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from . import scoring
+from .normalize import normalize_result
+
 load_dotenv()
 
 client = OpenAI(
@@ -15,47 +19,100 @@ client = OpenAI(
 # Groq's fast open-source Llama model
 MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 
+# The JSON object below is ~50 tokens; leave a little headroom for whitespace
+MAX_TOKENS = int(os.getenv("GROQ_MAX_TOKENS", "80"))
 
-def qualify_lead(message: str) -> dict:
-    """Qualify lead using Groq's Llama model."""
-
-    prompt = f"""You are a lead qualification assistant for a financial advisory service in India.
+# Static instructions go first and never change between calls, so the
+# provider can reuse the cached prefix. Only the lead message varies.
+SYSTEM_PROMPT = """You are a lead qualification assistant for a financial advisory service in India.
 
-Analyze this lead's message and extract information. Respond with ONLY a JSON object:
+Analyze the lead's message and extract information. Respond with ONLY a JSON object:
 
-{{
+{
   "goal": "investment | retirement | insurance | tax | wealth_management | unclear",
   "timeline": "immediate | 1-3_months | 6-12_months | 5+_years | unclear",
   "budget_range": "<5L | 5-20L | 20-50L | 50L+ | not_disclosed",
-  "quality_score": <number 0-100>
-}}
+  "clarity": "clear | vague | very_vague",
+  "completeness": "all | partial | minimal"
+}
+
+- clarity: how clearly the message states what the lead wants
+- completeness: whether goal, timeline and budget are all given (all), some (partial) or none (minimal)"""
+
+# Returned when the provider call or parsing fails. A real answer can carry the
+# same features, so callers check is_fallback() rather than comparing values.
+FALLBACK_RESULT = dict(scoring.apply({
+    "goal": "unclear",
+    "timeline": "unclear",
+    "budget_range": "not_disclosed",
+    "clarity": "vague",
+    "completeness": "minimal",
+}), fallback=True)
+
+# Running token totals for this process; updated from request threads
+usage_totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+_usage_lock = threading.Lock()
+
+
+def _record_usage(usage) -> dict:
+    """Add one call's token counts to the running totals."""
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+
+    with _usage_lock:
+        usage_totals["calls"] += 1
+        usage_totals["prompt_tokens"] += prompt_tokens
+        usage_totals["completion_tokens"] += completion_tokens
+
+    print(f"Groq usage: prompt={prompt_tokens} completion={completion_tokens}")
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
 
-Scoring guide:
-- Budget: <5L=20pts, 5-20L=30pts, 20-50L=35pts, 50L+=40pts, not_disclosed=10pts
-- Timeline: immediate=30pts, 1-3mo=25pts, 6-12mo=20pts, 5+yrs=15pts, unclear=5pts
-- Message clarity: Clear=20pts, Vague=10pts, Very vague=5pts
-- Completeness: All info=10pts, Partial=5pts, Minimal=0pts
 
-Lead's message: "{message}"
+def is_fallback(result: dict) -> bool:
+    """True if ``result`` is FALLBACK_RESULT, i.e. the LLM gave no usable answer."""
 
-Return ONLY the JSON object."""
+    return bool(result.get("fallback"))
+
+
+def get_usage_totals() -> dict:
+    """Snapshot of this process's LLM call and token counts."""
+
+    with _usage_lock:
+        return dict(usage_totals)
+
+
+def qualify_lead(message: str, timeout: float = None) -> dict:
+    """Qualify lead using Groq's Llama model; the score comes from scoring.py.
+
+    With a ``timeout`` the call is made once (no SDK retries) and abandoned
+    when the budget runs out; the fallback result is returned instead.
+    """
+
+    if timeout is not None and timeout <= 0:
+        print("Groq API skipped: no time left in request budget")
+        return dict(FALLBACK_RESULT)
+
+    api = client if timeout is None else client.with_options(timeout=timeout, max_retries=0)
 
     try:
-        response = client.chat.completions.create(
+        response = api.chat.completions.create(
             model=MODEL,
-            messages=[{"role": "user", "content": prompt}],
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": message},
+            ],
             temperature=0.1,
+            max_tokens=MAX_TOKENS,
+            response_format={"type": "json_object"},
         )
+        if response.usage is not None:
+            _record_usage(response.usage)
+
         text = response.choices[0].message.content.strip()
         text = text.replace("```json", "").replace("```", "").strip()
-        result = json.loads(text)
-        return result
+        return scoring.apply(normalize_result(json.loads(text)))
 
     except Exception as e:
         print(f"Groq API error: {e}")
-        return {
-            "goal": "unclear",
-            "timeline": "unclear",
-            "budget_range": "not_disclosed",
-            "quality_score": 30,
-        }
+        return dict(FALLBACK_RESULT)
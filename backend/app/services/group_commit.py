@@ -0,0 +1,146 @@
+"""Group-commit writer for lead inserts.
+
+Concurrent ``create_lead`` calls hand their row to a single writer thread,
+which gathers everything arriving within a short window into one multi-row
+INSERT ... RETURNING and one transaction (one fsync), then gives each caller
+back its own row. If the batch fails on a bad row (integrity or data error),
+its rows are retried one at a time so only the caller with that row gets the
+error. Callers never wait past their own timeout: a row still queued by then
+is withdrawn, and a failure such as a statement timeout fails the whole batch
+at once.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DataError, IntegrityError
+
+from ..database import engine
+from .. import models
+from .deadline import DeadlineExceeded
+
+ENABLED = os.getenv("LEAD_GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+WINDOW = float(os.getenv("LEAD_GROUP_COMMIT_WINDOW_MS", "5")) / 1000
+MAX_BATCH = int(os.getenv("LEAD_GROUP_COMMIT_MAX_BATCH", "100"))
+
+
+class GroupCommitWriter:
+    """Batches row inserts for one table arriving within ``window`` seconds."""
+
+    def __init__(self, table, window: float = WINDOW, max_batch: int = MAX_BATCH):
+        self.table = table
+        self.window = window
+        self.max_batch = max_batch
+        # (values, monotonic expiry or None, future)
+        self._queue: "queue.Queue[tuple[dict, Optional[float], Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"group-commit-{table.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, values: dict, timeout: Optional[float] = None):
+        """Queue one row and block until its batch is committed; returns the inserted row.
+
+        ``timeout`` (seconds) is the caller's remaining budget. It bounds the wait
+        and the batch's Postgres statement_timeout (the tightest among its rows).
+        Raises DeadlineExceeded if the row was still queued when it ran out.
+        """
+
+        future = Future()
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        self._queue.put((values, expires_at, future))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            if future.cancel():
+                raise DeadlineExceeded("Deadline exceeded before lead insert")
+            # Already in a batch whose statement_timeout fits this budget; take its outcome
+            return future.result()
+
+    def _collect(self) -> list:
+        """Block for the first row, then take whatever else arrives within the window."""
+
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, rows: list, timeout: Optional[float]) -> list:
+        stmt = insert(self.table).returning(*self.table.c, sort_by_parameter_order=True)
+        with engine.begin() as conn:
+            if timeout is not None and conn.dialect.name == 'postgresql':
+                # Transaction-local, so pooled connections keep their default
+                conn.execute(text("SELECT set_config('statement_timeout', :ms, true)"),
+                             {'ms': str(max(1, int(timeout * 1000)))})
+            return conn.execute(stmt, rows).all()
+
+    @staticmethod
+    def _live(batch: list) -> list:
+        """Drop rows whose caller gave up; fail rows whose time has run out."""
+
+        now = time.monotonic()
+        live = []
+        for values, expires_at, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            if expires_at is not None and expires_at <= now:
+                future.set_exception(DeadlineExceeded("Deadline exceeded before lead insert"))
+                continue
+            live.append((values, expires_at, future))
+        return live
+
+    def _run(self) -> None:
+        while True:
+            batch = self._live(self._collect())
+            if not batch:
+                continue
+            expiries = [expires_at for _, expires_at, _ in batch if expires_at is not None]
+            timeout = min(expiries) - time.monotonic() if expiries else None
+            try:
+                rows = self._insert([values for values, _, _ in batch], timeout)
+            except (IntegrityError, DataError) as e:
+                if len(batch) == 1:
+                    batch[0][2].set_exception(e)
+                    continue
+                # One bad row fails the whole statement; retry each row on its own, within its own budget
+                for values, expires_at, future in batch:
+                    remaining = expires_at - time.monotonic() if expires_at is not None else None
+                    if remaining is not None and remaining <= 0:
+                        future.set_exception(e)
+                        continue
+                    try:
+                        future.set_result(self._insert([values], remaining)[0])
+                    except Exception as row_error:
+                        future.set_exception(row_error)
+                continue
+            except Exception as e:
+                # Timeouts and connection errors would only repeat per row; fail fast
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future), row in zip(batch, rows):
+                future.set_result(row)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_lead_writer() -> GroupCommitWriter:
+    """Process-wide writer for the leads table, started on first use."""
+
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(models.Lead.__table__)
+    return _writer
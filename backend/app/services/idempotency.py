@@ -0,0 +1,69 @@
+"""Idempotency-Key handling for lead submission.
+
+The first request with a key claims it in the shared cache with a short-lived
+"pending" record, runs normally, then replaces the record with its response for
+IDEMPOTENCY_TTL seconds. A retry with the same key gets that stored response. If
+the original is still running, the retry polls until it finishes. A key reused
+with a different body is rejected. Failed requests release their key, so
+their retry runs the pipeline again.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from .cache import cache
+from .deadline import REQUEST_DEADLINE
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# A pending claim outlives the longest possible request, then frees the key if its worker died
+PENDING_TTL = REQUEST_DEADLINE + 10
+WAIT = float(os.getenv("IDEMPOTENCY_WAIT", str(REQUEST_DEADLINE)))
+POLL_INTERVAL = 0.1
+
+
+class KeyReused(Exception):
+    """The key was already used for a different request body."""
+
+
+class StillInFlight(Exception):
+    """The original request did not finish within WAIT seconds."""
+
+
+def fingerprint(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def begin(key: str, request_fingerprint: str) -> Optional[dict]:
+    """Claim ``key``; returns None if this request should run, else the stored response body."""
+
+    pending = {"state": "pending", "fingerprint": request_fingerprint}
+    waited_until = time.monotonic() + WAIT
+
+    while True:
+        if cache.add('idempotency', key, pending, ttl=PENDING_TTL):
+            return None
+
+        record = cache.get('idempotency', key)
+        if record is not None:
+            if record["fingerprint"] != request_fingerprint:
+                raise KeyReused(key)
+            if record["state"] == "done":
+                return record["body"]
+
+        # Still pending (or released between the two calls, and claimed on the next pass)
+        if time.monotonic() >= waited_until:
+            raise StillInFlight(key)
+        time.sleep(POLL_INTERVAL)
+
+
+def complete(key: str, request_fingerprint: str, body: dict) -> None:
+    cache.set('idempotency', key, {"state": "done", "fingerprint": request_fingerprint, "body": body}, ttl=TTL)
+
+
+def release(key: str) -> None:
+    cache.delete('idempotency', key)
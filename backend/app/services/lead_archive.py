@@ -0,0 +1,138 @@
+"""Monthly lead partitions and read-through to archived ones.
+
+On Postgres ``leads`` is range-partitioned by month (see the c9f2d4b6e7a8
+migration). ``ensure_partitions`` keeps LEAD_PARTITION_MONTHS_AHEAD months of
+empty partitions ready and moves any rows that landed in ``leads_default`` into
+proper monthly partitions; each API worker runs it at startup and then every
+LEAD_PARTITION_CHECK_INTERVAL seconds, and archive_leads.py before archiving.
+archive_leads.py exports old months to Parquet, drops them and records each
+file in ``lead_archives``. ``read_archived_lead`` lets ``crud.get_lead`` still
+answer for those ids.
+
+Reading archives needs the ``pyarrow`` package.
+"""
+
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import models
+
+MONTHS_AHEAD = int(os.getenv("LEAD_PARTITION_MONTHS_AHEAD", "3"))
+CHECK_INTERVAL = float(os.getenv("LEAD_PARTITION_CHECK_INTERVAL", "21600"))
+
+_stop = threading.Event()
+_worker = None
+
+
+def _rehome_default_rows(conn) -> int:
+    """Move rows out of leads_default into their own monthly partitions; returns how many.
+
+    Postgres refuses to create a month's partition while the default partition
+    holds rows for it, so the default is detached, the months it has rows for
+    get partitions, its rows go back in through ``leads`` and the emptied table
+    is attached again.
+    """
+
+    if conn.execute(text("SELECT to_regclass('leads_default')")).scalar() is None:
+        return 0
+
+    months = conn.execute(text(
+        "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') FROM leads_default"
+    )).scalars().all()
+    if not months:
+        return 0
+
+    conn.execute(text("ALTER TABLE leads DETACH PARTITION leads_default"))
+    for month in months:
+        start = month.replace(tzinfo=timezone.utc)
+        end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "leads_{start:%Y_%m}" PARTITION OF leads '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+    columns = ", ".join(column.name for column in models.Lead.__table__.c)
+    moved = conn.execute(text(f"INSERT INTO leads ({columns}) SELECT {columns} FROM leads_default")).rowcount
+    # Every row was copied, and TRUNCATE skips the row-level tombstone trigger
+    conn.execute(text("TRUNCATE leads_default"))
+    conn.execute(text("ALTER TABLE leads ATTACH PARTITION leads_default DEFAULT"))
+    return moved
+
+
+def ensure_partitions(engine, months_ahead: int = MONTHS_AHEAD) -> int:
+    """Create missing partitions through ``months_ahead`` months from now; returns how many."""
+
+    if engine.dialect.name != 'postgresql':
+        return 0
+
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regprocedure('create_lead_partitions(date, integer)')")).scalar() is None:
+            return 0  # partitioning migration not applied
+
+        # Several workers start at once; only one should be creating tables
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('create_lead_partitions'))"))
+
+        moved = _rehome_default_rows(conn)
+        if moved:
+            print(f"Lead partitions: moved {moved} row(s) out of leads_default")
+
+        return conn.execute(
+            text("SELECT create_lead_partitions((now() AT TIME ZONE 'UTC')::date, :ahead)"),
+            {'ahead': months_ahead}
+        ).scalar()
+
+
+def _run(engine) -> None:
+    while not _stop.wait(CHECK_INTERVAL):
+        try:
+            created = ensure_partitions(engine)
+            if created:
+                print(f"Lead partitions: created {created} partition(s)")
+        except Exception as e:
+            print(f"Lead partition maintenance error: {e}")
+
+
+def start_maintenance(engine) -> None:
+    """Keep partitions ahead of time in a background thread (Postgres only)."""
+
+    global _worker
+    if engine.dialect.name != 'postgresql' or CHECK_INTERVAL <= 0:
+        return
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run, args=(engine,), name="lead-partitions", daemon=True)
+        _worker.start()
+
+
+def shutdown() -> None:
+    _stop.set()
+
+
+def _read_parquet_row(path: str, lead_id: int) -> Optional[dict]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Lead archives exist but the 'pyarrow' package is not installed")
+
+    # Files are written sorted by id, so row-group statistics skip most of the file
+    rows = pq.read_table(path, filters=[('id', '=', lead_id)]).to_pylist()
+    return rows[0] if rows else None
+
+
+def read_archived_lead(db: Session, lead_id: int) -> Optional[dict]:
+    """Lead row from an archived partition, or None"""
+
+    archives = db.query(models.LeadArchive).filter(
+        models.LeadArchive.min_id <= lead_id,
+        models.LeadArchive.max_id >= lead_id
+    ).all()
+
+    for archive in archives:
+        row = _read_parquet_row(archive.path, lead_id)
+        if row is not None:
+            return row
+    return None
@@ -0,0 +1,195 @@
+"""Compact hashed n-gram linear model distilled from stored LLM labels.
+
+The weights are trained offline by ``train_classifier.py`` on leads the LLM
+has already qualified, saved as plain ``.npy`` files and memory-mapped here
+so every worker shares the same pages.
+"""
+
+import json
+import os
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+MODEL_PATH = os.getenv("LOCAL_MODEL_PATH", "models/lead_classifier")
+N_FEATURES = 2 ** 16
+
+CATEGORICAL_FIELDS = ("goal", "timeline", "budget_range")
+SCORE_FIELD = "quality_score"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Loaded model: {"meta": dict, "weights": {field: np.ndarray}}
+_model: Optional[dict] = None
+
+
+def featurize(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Hash word unigrams and bigrams into (indices, l2-normalised values).
+
+    The last index (N_FEATURES) is a bias feature present in every row.
+    """
+
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    counts: dict[int, float] = {}
+    for gram in grams:
+        idx = zlib.crc32(gram.encode()) % N_FEATURES
+        counts[idx] = counts.get(idx, 0.0) + 1.0
+
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values /= norm
+
+    return np.append(indices, N_FEATURES), np.append(values, np.float32(1.0))
+
+
+def build_matrix(texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Featurize texts into CSR arrays (indptr, indices, data)."""
+
+    rows = [featurize(t) for t in texts]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(idx) for idx, _ in rows])
+    indices = np.concatenate([idx for idx, _ in rows]) if rows else np.zeros(0, np.int64)
+    data = np.concatenate([val for _, val in rows]) if rows else np.zeros(0, np.float32)
+    return indptr, indices, data
+
+
+def _sparse_dot(indptr, indices, data, weights) -> np.ndarray:
+    """Multiply a CSR matrix by a dense (n_features + 1, k) weight matrix."""
+
+    products = weights[indices] * data[:, None]
+    return np.add.reduceat(products, indptr[:-1], axis=0)
+
+
+def _sparse_grad(indptr, indices, data, err, shape) -> np.ndarray:
+    """Accumulate X^T @ err for a CSR matrix X."""
+
+    row_of_nnz = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    grad = np.zeros(shape, dtype=np.float32)
+    np.add.at(grad, indices, data[:, None] * err[row_of_nnz])
+    return grad
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def fit_softmax(matrix, y: np.ndarray, n_classes: int, epochs: int = 30,
+                lr: float = 0.5, l2: float = 1e-4, batch_size: int = 256) -> np.ndarray:
+    """Fit multinomial logistic regression with mini-batch gradient descent."""
+
+    indptr, indices, data = matrix
+    n_rows = len(indptr) - 1
+    weights = np.zeros((N_FEATURES + 1, n_classes), dtype=np.float32)
+    rng = np.random.default_rng(0)
+
+    for _ in range(epochs):
+        for batch in np.array_split(rng.permutation(n_rows), max(1, n_rows // batch_size)):
+            b_indptr, b_indices, b_data = _take_rows(indptr, indices, data, batch)
+            probs = _softmax(_sparse_dot(b_indptr, b_indices, b_data, weights))
+            probs[np.arange(len(batch)), y[batch]] -= 1.0
+            grad = _sparse_grad(b_indptr, b_indices, b_data, probs, weights.shape)
+            weights -= lr * (grad / len(batch) + l2 * weights)
+
+    return weights
+
+
+def fit_regression(matrix, y: np.ndarray, epochs: int = 30, lr: float = 0.5,
+                   l2: float = 1e-4, batch_size: int = 256) -> np.ndarray:
+    """Fit ridge regression on targets scaled to 0-1."""
+
+    indptr, indices, data = matrix
+    n_rows = len(indptr) - 1
+    weights = np.zeros((N_FEATURES + 1, 1), dtype=np.float32)
+    target = (y.astype(np.float32) / 100.0)[:, None]
+    rng = np.random.default_rng(0)
+
+    for _ in range(epochs):
+        for batch in np.array_split(rng.permutation(n_rows), max(1, n_rows // batch_size)):
+            b_indptr, b_indices, b_data = _take_rows(indptr, indices, data, batch)
+            err = _sparse_dot(b_indptr, b_indices, b_data, weights) - target[batch]
+            grad = _sparse_grad(b_indptr, b_indices, b_data, err, weights.shape)
+            weights -= lr * (grad / len(batch) + l2 * weights)
+
+    return weights
+
+
+def _take_rows(indptr, indices, data, rows):
+    """Slice a subset of rows out of CSR arrays."""
+
+    starts, ends = indptr[rows], indptr[rows + 1]
+    lengths = ends - starts
+    new_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    new_indptr[1:] = np.cumsum(lengths)
+    take = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+    return new_indptr, indices[take], data[take]
+
+
+def save_model(path: str, weights: dict, labels: dict, n_samples: int) -> None:
+    """Write weights as .npy files plus a meta.json describing the labels."""
+
+    os.makedirs(path, exist_ok=True)
+    for field, w in weights.items():
+        np.save(os.path.join(path, f"{field}.npy"), w.astype(np.float32))
+
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"n_features": N_FEATURES, "labels": labels, "n_samples": n_samples}, f)
+
+
+def load_model(path: str = MODEL_PATH) -> Optional[dict]:
+    """Memory-map a trained model; returns None when no artifact exists."""
+
+    global _model
+
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        print(f"Local classifier not found at {path}, using LLM only")
+        _model = None
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    weights = {
+        field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r")
+        for field in CATEGORICAL_FIELDS + (SCORE_FIELD,)
+    }
+    _model = {"meta": meta, "weights": weights}
+    print(f"Local classifier loaded ({meta['n_samples']} training samples)")
+    return _model
+
+
+def predict(message: str) -> Optional[tuple[dict, float]]:
+    """Predict all four fields; returns (result, confidence) or None.
+
+    Confidence is the lowest top-class probability across the categorical
+    fields, so one uncertain field is enough to defer to the LLM.
+    """
+
+    if _model is None:
+        return None
+
+    indices, values = featurize(message)
+    weights = _model["weights"]
+    labels = _model["meta"]["labels"]
+
+    result = {}
+    confidence = 1.0
+    for field in CATEGORICAL_FIELDS:
+        logits = values @ weights[field][indices]
+        probs = _softmax(logits[None, :])[0]
+        best = int(probs.argmax())
+        result[field] = labels[field][best]
+        confidence = min(confidence, float(probs[best]))
+
+    score = float(values @ weights[SCORE_FIELD][indices][:, 0]) * 100
+    result[SCORE_FIELD] = int(min(100, max(0, round(score))))
+
+    return result, confidence
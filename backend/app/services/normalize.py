@@ -0,0 +1,82 @@
+"""Map free-text qualification output onto the allowed enum values.
+
+The LLM mostly answers with the exact values from the prompt, but variants
+such as "1-3 months", "Wealth Management" or "5-20 lakhs" show up too. Each
+field is matched on a canonical key (lower case, no spaces/underscores/
+hyphens) first. Otherwise the rule-based extractors parse the value as free
+text, and anything still unrecognised becomes the field's "unknown" value.
+The LLM does not score leads; see scoring.py.
+"""
+
+import re
+
+from ..models import LEAD_BUDGET_RANGES, LEAD_CLARITY, LEAD_COMPLETENESS, LEAD_GOALS, LEAD_TIMELINES
+from . import rule_scoring
+
+
+def _key(value: str) -> str:
+    key = re.sub(r"[\s_\-]+", "", value.lower())
+    return re.sub(r"(lakhs?|lacs?)", "l", key)
+
+
+def _lookup(values, aliases: dict) -> dict:
+    table = {_key(value): value for value in values}
+    table.update({_key(alias): value for alias, value in aliases.items()})
+    return table
+
+
+_GOALS = _lookup(LEAD_GOALS, {"wealth": "wealth_management", "tax saving": "tax", "unknown": "unclear"})
+_TIMELINES = _lookup(LEAD_TIMELINES, {
+    "asap": "immediate", "now": "immediate",
+    "1-3 mo": "1-3_months", "6-12 mo": "6-12_months", "5+ yrs": "5+_years", "5+": "5+_years",
+    "unknown": "unclear",
+})
+_BUDGETS = _lookup(LEAD_BUDGET_RANGES, {
+    "under 5L": "<5L", "below 5L": "<5L", ">50L": "50L+", "above 50L": "50L+",
+    "unknown": "not_disclosed", "none": "not_disclosed", "n/a": "not_disclosed", "unclear": "not_disclosed",
+})
+_CLARITY = _lookup(LEAD_CLARITY, {"very clear": "clear", "somewhat vague": "vague", "unclear": "very_vague"})
+_COMPLETENESS = _lookup(LEAD_COMPLETENESS, {"complete": "all", "all info": "all", "none": "minimal"})
+
+
+def normalize_goal(value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        return "unclear"
+    return _GOALS.get(_key(value)) or rule_scoring.extract_goal(value)
+
+
+def normalize_timeline(value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        return "unclear"
+    return _TIMELINES.get(_key(value)) or rule_scoring.extract_timeline(value)
+
+
+def normalize_budget(value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        return "not_disclosed"
+    return _BUDGETS.get(_key(value)) or rule_scoring.extract_budget(value)
+
+
+def normalize_clarity(value) -> str:
+    if not isinstance(value, str):
+        return "vague"
+    return _CLARITY.get(_key(value), "vague")
+
+
+def normalize_completeness(value, result: dict) -> str:
+    if isinstance(value, str) and _key(value) in _COMPLETENESS:
+        return _COMPLETENESS[_key(value)]
+    return rule_scoring.extract_completeness(result)
+
+
+def normalize_result(result: dict) -> dict:
+    """Qualification features with every field on an allowed value."""
+
+    features = {
+        "goal": normalize_goal(result.get("goal")),
+        "timeline": normalize_timeline(result.get("timeline")),
+        "budget_range": normalize_budget(result.get("budget_range")),
+        "clarity": normalize_clarity(result.get("clarity")),
+    }
+    features["completeness"] = normalize_completeness(result.get("completeness"), features)
+    return features
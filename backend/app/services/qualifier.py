@@ -0,0 +1,121 @@
+"""Lead qualification entry point: local classifier first, LLM when unsure."""
+
+import hashlib
+import os
+import random
+import threading
+import time
+
+from . import admission, local_classifier, rule_scoring, scoring
+from .cache import cache
+from .groq_ai import get_usage_totals, is_fallback, qualify_lead as llm_qualify_lead
+
+# Minimum local confidence required to skip the LLM call
+CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_MODEL_THRESHOLD", "0.85"))
+
+# Fraction of confident predictions still sent to the LLM to measure agreement
+AUDIT_RATE = float(os.getenv("LOCAL_MODEL_AUDIT_RATE", "0.05"))
+
+# Identical messages (retries, copy-pasted campaign text) reuse the last result
+RESULT_TTL = int(os.getenv("QUALIFY_CACHE_TTL", "86400"))
+
+FIELDS = local_classifier.CATEGORICAL_FIELDS
+
+# Updated from request threads
+qualifier_stats = {
+    "local": 0,
+    "llm": 0,
+    "compared": 0,
+    "agreed": {field: 0 for field in FIELDS},
+    "score_abs_error": 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _local_result(message: str, prediction: dict) -> dict:
+    """What the local path serves: predicted features plus rule-based clarity/completeness, scored."""
+
+    # The classifier predicts goal/timeline/budget; clarity and completeness come from rules
+    features = {field: prediction[field] for field in FIELDS}
+    features["clarity"] = rule_scoring.extract_clarity(message)
+    features["completeness"] = rule_scoring.extract_completeness(features)
+    return scoring.apply(features)
+
+
+def _compare(local: dict, llm: dict) -> None:
+    """Record how closely the locally served result matched the LLM's answer."""
+
+    with _stats_lock:
+        qualifier_stats["compared"] += 1
+        for field in FIELDS:
+            if local.get(field) == llm.get(field):
+                qualifier_stats["agreed"][field] += 1
+        qualifier_stats["score_abs_error"] += abs(local["quality_score"] - llm["quality_score"])
+
+
+def qualify_lead(message: str, timeout: float = None) -> dict:
+    """Qualify a lead from cache, else the local model, else the LLM.
+
+    ``timeout`` bounds the wait for an LLM slot plus the LLM call; returns
+    FALLBACK_RESULT (see is_fallback) if it runs out. Raises admission.Overloaded
+    if no slot frees up in time; cache hits and local answers never need one.
+    """
+
+    key = hashlib.sha256(" ".join(message.lower().split()).encode()).hexdigest()
+    result = cache.get('qualify', key)
+    if result is not None:
+        # Cached features outlive weight changes; score with the current table
+        return scoring.apply(result)
+
+    result = _qualify_uncached(message, timeout)
+    if not is_fallback(result):
+        cache.set('qualify', key, result, ttl=RESULT_TTL)
+    return result
+
+
+def _qualify_uncached(message: str, timeout: float = None) -> dict:
+    prediction = local_classifier.predict(message)
+
+    if prediction is not None:
+        local_result, confidence = prediction
+        if confidence >= CONFIDENCE_THRESHOLD and random.random() >= AUDIT_RATE:
+            with _stats_lock:
+                qualifier_stats["local"] += 1
+            return _local_result(message, local_result)
+
+    started = time.monotonic()
+    with admission.controller.admit(timeout=timeout):
+        if timeout is not None:
+            timeout = max(0.0, timeout - (time.monotonic() - started))
+        result = llm_qualify_lead(message, timeout=timeout)
+    with _stats_lock:
+        qualifier_stats["llm"] += 1
+
+    if prediction is not None and not is_fallback(result):
+        _compare(_local_result(message, prediction[0]), result)
+
+    return result
+
+
+def get_qualifier_stats() -> dict:
+    """Summarise local/LLM traffic split, agreement rates and LLM token usage."""
+
+    with _stats_lock:
+        stats = dict(qualifier_stats, agreed=dict(qualifier_stats["agreed"]))
+
+    total = stats["local"] + stats["llm"]
+    compared = stats["compared"]
+
+    return {
+        "total": total,
+        "served_local": stats["local"],
+        "served_llm": stats["llm"],
+        "llm_calls_saved_pct": round(100 * stats["local"] / total, 1) if total else 0.0,
+        "compared": compared,
+        "agreement": {
+            field: round(stats["agreed"][field] / compared, 3) if compared else None
+            for field in FIELDS
+        },
+        "score_mae": round(stats["score_abs_error"] / compared, 2) if compared else None,
+        "llm_usage": get_usage_totals(),
+    }
@@ -0,0 +1,197 @@
+"""Buffered, incremental maintenance of ``lead_daily_rollups``.
+
+Writes call ``add_lead``/``add`` with +1/-1 deltas. Deltas for the same
+(day, source, goal, status bucket) are summed in memory, and a background
+thread applies them with one upsert per key. That way the hot "today" rows are
+not locked by every insert. reconcile_rollups.py rebuilds recent days from
+``leads`` nightly to correct anything lost between flushes.
+
+Each delta carries the database timestamp of the lead change behind it. A
+rebuild leaves a fence (day range, time) in ``lead_rollup_fences``, and flushes
+drop deltas inside a fence's range from before its time, since the rebuilt
+counts already include them. On Postgres an advisory lock keeps flushes out
+while a rebuild runs.
+"""
+
+import atexit
+import os
+import threading
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..database import SessionLocal
+from .. import models
+
+FLUSH_INTERVAL = float(os.getenv("ROLLUP_FLUSH_INTERVAL", "1"))
+
+STATUS_BUCKETS = {
+    "new": "open",
+    "assigned": "open",
+    "contacted": "in_progress",
+    "meeting_booked": "in_progress",
+    "closed": "closed",
+    "lost": "lost",
+}
+DEFAULT_BUCKET = "open"
+
+# Same thresholds as the dashboard stats
+HOT_SCORE = 70
+WARM_SCORE = 40
+
+METRICS = ("lead_count", "score_sum", "hot", "warm", "cold", "fraud")
+
+# Taken shared by flushes and exclusively by reconcile_daily_rollups (Postgres)
+LOCK_SQL = "SELECT pg_advisory_xact_lock{mode}(hashtext('lead_daily_rollups'))"
+
+_pending: dict = {}
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_stop = threading.Event()
+_worker = None
+
+
+def status_bucket(status) -> str:
+    return STATUS_BUCKETS.get(status, DEFAULT_BUCKET)
+
+
+def lead_day(created_at) -> date:
+    """UTC day for a created_at value as returned by either backend."""
+
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if isinstance(created_at, str):
+        return date.fromisoformat(created_at[:10])
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.date()
+    return created_at
+
+
+def lead_metrics(quality_score, is_fraud) -> tuple:
+    """One lead's contribution to each METRICS column."""
+
+    scored = quality_score is not None
+    return (
+        1,
+        quality_score or 0,
+        int(scored and quality_score >= HOT_SCORE),
+        int(scored and WARM_SCORE <= quality_score < HOT_SCORE),
+        int(scored and quality_score < WARM_SCORE),
+        int(bool(is_fraud)),
+    )
+
+
+def rollup_key(day, source, goal, status) -> tuple:
+    return (lead_day(day), source or "unknown", goal or "unknown", status_bucket(status))
+
+
+def _utc(value) -> datetime:
+    """Timestamp from either backend as an aware UTC datetime (SQLite's are naive UTC)."""
+
+    if value is None:
+        return datetime.now(timezone.utc)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def add(day, source, goal, status, metrics, sign: int = 1, changed_at=None) -> None:
+    """Queue a delta of ``sign`` × ``metrics`` for one rollup row.
+
+    ``changed_at`` is the database time of the lead change (default: now).
+    """
+
+    entry = (rollup_key(day, source, goal, status), _utc(changed_at))
+    with _lock:
+        totals = _pending.setdefault(entry, [0] * len(METRICS))
+        for i, value in enumerate(metrics):
+            totals[i] += sign * value
+    _ensure_worker()
+
+
+def add_lead(row, sign: int = 1) -> None:
+    add(row.created_at, row.source, row.goal, row.status, lead_metrics(row.quality_score, row.is_fraud), sign,
+        changed_at=row.updated_at or row.created_at)
+
+
+def upsert_statement(dialect_name: str):
+    """INSERT that adds to an existing rollup row instead of failing on the key."""
+
+    table = models.LeadDailyRollup.__table__
+    stmt = (pg_insert if dialect_name == "postgresql" else sqlite_insert)(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key],
+        set_={metric: table.c[metric] + stmt.excluded[metric] for metric in METRICS},
+    )
+
+
+def flush() -> int:
+    """Apply all queued deltas; returns the number of rollup rows touched."""
+
+    global _pending
+
+    with _flush_lock:
+        with _lock:
+            pending, _pending = _pending, {}
+
+        if not any(any(totals) for totals in pending.values()):
+            return 0
+
+        db = SessionLocal()
+        try:
+            if db.bind.dialect.name == "postgresql":
+                # Waits out a running rebuild, so its fence is visible below
+                db.execute(text(LOCK_SQL.format(mode="_shared")))
+            fence = models.LeadRollupFence
+            fences = [(start, end, _utc(fenced_at)) for start, end, fenced_at in
+                      db.query(fence.day_from, fence.day_to, fence.fenced_at).all()]
+
+            merged = {}
+            for (key, changed_at), totals in pending.items():
+                if any(start <= key[0] <= end and changed_at < fenced_at for start, end, fenced_at in fences):
+                    continue  # already counted by that rebuild
+                row = merged.setdefault(key, [0] * len(METRICS))
+                for i, value in enumerate(totals):
+                    row[i] += value
+
+            rows = [
+                dict(zip(("day", "source", "goal", "status_bucket"), key), **dict(zip(METRICS, totals)))
+                for key, totals in merged.items()
+                if any(totals)
+            ]
+            if rows:
+                db.execute(upsert_statement(db.bind.dialect.name), rows)
+            db.commit()
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            print(f"Rollup flush error ({len(rows)} deltas dropped until reconcile): {e}")
+            return 0
+        finally:
+            db.close()
+
+
+def _run() -> None:
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run, name="lead-rollups", daemon=True)
+        _worker.start()
+
+
+def shutdown() -> None:
+    """Stop the background thread and apply any remaining deltas."""
+
+    _stop.set()
+    flush()
+
+
+atexit.register(shutdown)
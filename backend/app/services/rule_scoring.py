@@ -0,0 +1,96 @@
+"""Fast rule-based lead scoring, used when the LLM is unavailable or overloaded.
+
+Extracts the qualification features with keyword/regex rules and scores them
+with the shared weight table. Leads scored here are flagged for
+re-qualification so the LLM result replaces this estimate later.
+"""
+
+import re
+
+from . import scoring
+
+_AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(crores?|cr\b|lakhs?|lacs?|l\b)", re.IGNORECASE)
+_MONTHS_RE = re.compile(r"(\d+)\s*months?", re.IGNORECASE)
+_YEARS_RE = re.compile(r"(\d+)\s*(?:years?|yrs?)", re.IGNORECASE)
+
+GOAL_KEYWORDS = [
+    ("retirement", ("retire", "pension")),
+    ("tax", ("tax", "80c", "80d", "elss")),
+    ("insurance", ("insurance", "insure", "term plan", "health cover")),
+    ("wealth_management", ("wealth", "portfolio", "pms", "estate")),
+    ("investment", ("invest", "mutual fund", "sip", "stock", "equity", "fd")),
+]
+
+IMMEDIATE_KEYWORDS = ("urgent", "immediately", "asap", "right away", "this month", "ending soon", "soon")
+
+
+def extract_budget(message: str) -> str:
+    lakhs = []
+    for amount, unit in _AMOUNT_RE.findall(message):
+        value = float(amount)
+        lakhs.append(value * 100 if unit.lower().startswith("cr") else value)
+
+    if not lakhs:
+        return "not_disclosed"
+
+    amount = max(lakhs)
+    if amount < 5:
+        return "<5L"
+    if amount < 20:
+        return "5-20L"
+    if amount < 50:
+        return "20-50L"
+    return "50L+"
+
+
+def extract_timeline(message: str) -> str:
+    text = message.lower()
+    if any(word in text for word in IMMEDIATE_KEYWORDS):
+        return "immediate"
+
+    months = _MONTHS_RE.search(text)
+    if months:
+        return "1-3_months" if int(months.group(1)) <= 3 else "6-12_months"
+
+    years = _YEARS_RE.search(text)
+    if years:
+        return "5+_years" if int(years.group(1)) >= 5 else "6-12_months"
+
+    return "unclear"
+
+
+def extract_goal(message: str) -> str:
+    text = message.lower()
+    for goal, keywords in GOAL_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return goal
+    return "unclear"
+
+
+def extract_clarity(message: str) -> str:
+    words = len(message.split())
+    return "clear" if words >= 15 else "vague" if words >= 6 else "very_vague"
+
+
+def extract_completeness(result: dict) -> str:
+    """How many of goal, timeline and budget_range are known."""
+
+    known = sum([
+        result.get("goal") not in (None, "unclear"),
+        result.get("timeline") not in (None, "unclear"),
+        result.get("budget_range") not in (None, "not_disclosed"),
+    ])
+    return "all" if known == 3 else "partial" if known else "minimal"
+
+
+def score_lead(message: str) -> dict:
+    """Qualification dict in the same shape the LLM path returns."""
+
+    result = {
+        "goal": extract_goal(message),
+        "timeline": extract_timeline(message),
+        "budget_range": extract_budget(message),
+        "clarity": extract_clarity(message),
+    }
+    result["completeness"] = extract_completeness(result)
+    return scoring.apply(result)
@@ -0,0 +1,52 @@
+"""Lead quality score from qualification features and a versioned weight table.
+
+The LLM, the local classifier and the rule-based scorer only supply features
+(budget_range, timeline, clarity, completeness); the score is the sum of each
+feature's points in ``WEIGHTS``. To change the weights add a new version rather
+than editing an old one, then run ``rescore_leads.py``: stored leads are
+re-scored from their stored features in one UPDATE, without any LLM calls.
+"""
+
+import operator
+import os
+from functools import reduce
+
+from sqlalchemy import case
+
+FEATURES = ("budget_range", "timeline", "clarity", "completeness")
+MAX_SCORE = 100
+
+WEIGHTS = {
+    # The point table the LLM prompt used to describe
+    1: {
+        "budget_range": {"<5L": 20, "5-20L": 30, "20-50L": 35, "50L+": 40, "not_disclosed": 10},
+        "timeline": {"immediate": 30, "1-3_months": 25, "6-12_months": 20, "5+_years": 15, "unclear": 5},
+        "clarity": {"clear": 20, "vague": 10, "very_vague": 5},
+        "completeness": {"all": 10, "partial": 5, "minimal": 0},
+    },
+}
+
+SCORE_VERSION = int(os.getenv("SCORE_WEIGHTS_VERSION", max(WEIGHTS)))
+
+
+def score(features: dict, version: int = SCORE_VERSION) -> int:
+    """Points for one lead's features; unknown or missing values score 0."""
+
+    table = WEIGHTS[version]
+    return min(MAX_SCORE, sum(table[feature].get(features.get(feature), 0) for feature in FEATURES))
+
+
+def apply(result: dict, version: int = SCORE_VERSION) -> dict:
+    """Qualification dict with quality_score and score_version filled in from its features."""
+
+    return dict(result, quality_score=score(result, version), score_version=version)
+
+
+def score_expression(columns, version: int = SCORE_VERSION):
+    """SQL equivalent of ``score``; ``columns`` maps each feature to its column."""
+
+    total = reduce(operator.add, [
+        case(points, value=columns[feature], else_=0)
+        for feature, points in WEIGHTS[version].items()
+    ])
+    return case((total > MAX_SCORE, MAX_SCORE), else_=total)
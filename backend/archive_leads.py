@@ -0,0 +1,191 @@
+"""Create upcoming lead partitions and archive old ones to Parquet.
+
+Postgres only, after the monthly partitioning migration. ``ensure`` (also run
+before every ``archive``) creates upcoming partitions and moves rows stranded in
+``leads_default`` into their own month. A month is archived
+once it ended more than ``--older-than`` months ago and every lead in it is
+closed or lost. Its rows are written to a zstd-compressed Parquet file sorted by
+id, then the partition is detached and dropped and the file is recorded in
+``lead_archives``. GET /api/leads/{id} keeps serving those leads from the file.
+
+Usage:
+    python archive_leads.py ensure                        # partitions for the next months
+    python archive_leads.py archive --older-than 12
+    python archive_leads.py archive --older-than 12 --dry-run
+    python archive_leads.py archive --older-than 24 --include-open --keep-table
+
+Needs the ``pyarrow`` package.
+"""
+
+import argparse
+import os
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Boolean, DateTime, Integer, insert, text
+
+from app.database import engine
+from app import models
+from app.services import lead_archive
+from app.services.cache import cache, warn_if_not_shared
+
+ARCHIVE_DIR = os.getenv("LEAD_ARCHIVE_DIR", "archives")
+CLOSED_STATUSES = ("closed", "lost")
+BATCH_SIZE = 10000
+
+_PARTITION_RE = re.compile(r"^leads_(\d{4})_(\d{2})$")
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _arrow_schema(pa):
+    def arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pa.bool_()
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us", tz="UTC")
+        if isinstance(column.type, JSON):
+            return pa.list_(pa.string())
+        return pa.string()
+
+    return pa.schema([(column.name, arrow_type(column)) for column in models.Lead.__table__.columns])
+
+
+def list_partitions(conn) -> list:
+    """(name, range_start, range_end) for each monthly partition, oldest first."""
+
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'leads'::regclass ORDER BY c.relname"
+    )).scalars()
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions.append((name, _month_start(year, month), _month_start(year, month + 1)))
+    return partitions
+
+
+def export_partition(conn, name: str, path: str) -> int:
+    """Stream one partition into a Parquet file; returns the row count."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    columns = ", ".join(schema.names)
+    rows_written = 0
+
+    result = conn.execution_options(stream_results=True).execute(
+        text(f'SELECT {columns} FROM "{name}" ORDER BY id')
+    )
+    with pq.ParquetWriter(path + ".tmp", schema, compression="zstd") as writer:
+        for rows in result.partitions(BATCH_SIZE):
+            batch = pa.Table.from_pylist([dict(row._mapping) for row in rows], schema=schema)
+            writer.write_table(batch, row_group_size=BATCH_SIZE)
+            rows_written += len(rows)
+
+    os.replace(path + ".tmp", path)
+    return rows_written
+
+
+def archive(older_than: int, archive_dir: str, include_open: bool, keep_table: bool, dry_run: bool) -> None:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("❌ archive needs the 'pyarrow' package (pip install pyarrow)")
+
+    if not dry_run:
+        # Also moves any rows stranded in leads_default into their monthly partitions
+        created = lead_archive.ensure_partitions(engine)
+        if created:
+            print(f"✅ Created {created} partition(s)")
+
+    now = datetime.now(timezone.utc)
+    cutoff = _month_start(now.year, now.month - older_than)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    with engine.connect() as conn:
+        candidates = [p for p in list_partitions(conn) if p[2] <= cutoff]
+
+    if not candidates:
+        print(f"Nothing to archive before {cutoff:%Y-%m}")
+        return
+
+    archived = 0
+    for name, range_start, range_end in candidates:
+        # One transaction per month: writes to it are blocked from count to drop
+        with engine.begin() as conn:
+            conn.execute(text(f'LOCK TABLE "{name}" IN EXCLUSIVE MODE'))
+            total, still_open, min_id, max_id = conn.execute(text(
+                f"SELECT count(*), "
+                f"count(*) FILTER (WHERE coalesce(status, 'new') NOT IN {CLOSED_STATUSES!r}), "
+                f'min(id), max(id) FROM "{name}"'
+            )).one()
+
+            if still_open and not include_open:
+                print(f"⏭  {name}: {still_open} of {total} leads still open, skipped")
+                continue
+            if dry_run:
+                print(f"   {name}: would archive {total} leads")
+                continue
+
+            path = None
+            if total:
+                path = os.path.abspath(os.path.join(archive_dir, f"{name}.parquet"))
+                written = export_partition(conn, name, path)
+                if written != total or pq.ParquetFile(path).metadata.num_rows != total:
+                    raise RuntimeError(f"{name}: exported {written} rows, expected {total}; partition left attached")
+
+            conn.execute(text(f'ALTER TABLE leads DETACH PARTITION "{name}"'))
+            if total:
+                conn.execute(insert(models.LeadArchive).values(
+                    partition_name=name,
+                    range_start=range_start,
+                    range_end=range_end,
+                    min_id=min_id,
+                    max_id=max_id,
+                    row_count=total,
+                    path=path,
+                ))
+            if not keep_table:
+                conn.execute(text(f'DROP TABLE "{name}"'))
+
+        archived += 1
+        print(f"✅ {name}: {total} leads" + (f" → {path}" if path else " (empty, dropped)"))
+
+    if archived:
+        cache.invalidate('stats')
+        warn_if_not_shared()
+    print(f"\n{archived} partition(s) archived")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain monthly lead partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure_parser = commands.add_parser("ensure", help="create partitions for the coming months")
+    ensure_parser.add_argument("--months-ahead", type=int, default=lead_archive.MONTHS_AHEAD)
+
+    archive_parser = commands.add_parser("archive", help="export old partitions to Parquet and detach them")
+    archive_parser.add_argument("--older-than", type=int, default=12, help="months before the current one")
+    archive_parser.add_argument("--dir", default=ARCHIVE_DIR, help="where Parquet files are written")
+    archive_parser.add_argument("--include-open", action="store_true", help="archive months with open leads too")
+    archive_parser.add_argument("--keep-table", action="store_true", help="detach but do not drop the partition")
+    archive_parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("❌ Lead partitioning needs PostgreSQL")
+
+    if args.command == "ensure":
+        print(f"✅ Created {lead_archive.ensure_partitions(engine, args.months_ahead)} partition(s)")
+    else:
+        archive(args.older_than, args.dir, args.include_open, args.keep_table, args.dry_run)
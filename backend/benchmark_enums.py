@@ -0,0 +1,115 @@
+"""Benchmark varchar vs enum categorical lead columns on Postgres.
+
+Loads the same synthetic leads into two temp tables, one with the old
+varchar(50) goal/timeline/budget_range/status columns and one with the enum
+types from the f2c5a7b9d0e1 migration. It then reports table and index sizes
+and the best-of-N time for the dashboard's typical aggregate queries.
+
+Usage:
+    python benchmark_enums.py                      # 1,000,000 rows
+    python benchmark_enums.py --rows 200000 --repeat 10
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.database import engine
+from app import models
+
+COLUMNS = {
+    "goal": ("lead_goal", models.LEAD_GOALS),
+    "timeline": ("lead_timeline", models.LEAD_TIMELINES),
+    "budget_range": ("lead_budget_range", models.LEAD_BUDGET_RANGES),
+    "status": ("lead_status", models.LEAD_STATUSES),
+}
+
+QUERIES = {
+    "GROUP BY goal, status": "SELECT goal, status, count(*), avg(quality_score) FROM {t} GROUP BY goal, status",
+    "GROUP BY budget, timeline": "SELECT budget_range, timeline, count(*) FROM {t} GROUP BY budget_range, timeline",
+    "COUNT status = contacted": "SELECT count(*) FROM {t} WHERE status = 'contacted'",
+    "COUNT goal = tax, 50L+": "SELECT count(*) FROM {t} WHERE goal = 'tax' AND budget_range = '50L+'",
+}
+
+
+def _random_choice(values) -> str:
+    array = ", ".join(f"'{value}'" for value in values)
+    return f"(ARRAY[{array}])[1 + floor(random() * {len(values)})::int]"
+
+
+def setup(conn, rows: int) -> None:
+    text_columns = ", ".join(f"{column} varchar(50)" for column in COLUMNS)
+    enum_columns = ", ".join(f"{column} {type_name}" for column, (type_name, _) in COLUMNS.items())
+
+    conn.execute(text(f"CREATE TEMP TABLE bench_text (id serial PRIMARY KEY, {text_columns}, quality_score integer)"))
+    conn.execute(text(f"CREATE TEMP TABLE bench_enum (id serial PRIMARY KEY, {enum_columns}, quality_score integer)"))
+
+    conn.execute(text(
+        f"INSERT INTO bench_text ({', '.join(COLUMNS)}, quality_score) "
+        f"SELECT {', '.join(_random_choice(values) for _, values in COLUMNS.values())}, floor(random() * 101)::int "
+        f"FROM generate_series(1, :rows)"
+    ), {"rows": rows})
+    conn.execute(text(
+        f"INSERT INTO bench_enum ({', '.join(COLUMNS)}, quality_score) "
+        f"SELECT {', '.join(f'{column}::{type_name}' for column, (type_name, _) in COLUMNS.items())}, quality_score "
+        f"FROM bench_text ORDER BY id"
+    ))
+
+    for table in ("bench_text", "bench_enum"):
+        conn.execute(text(f"CREATE INDEX ON {table} (goal)"))
+        conn.execute(text(f"CREATE INDEX ON {table} (status)"))
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+def sizes(conn, table: str) -> tuple:
+    return conn.execute(text(
+        f"SELECT pg_relation_size('{table}'), pg_indexes_size('{table}')"
+    )).one()
+
+
+def best_time(conn, sql: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql)).all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _row(label: str, before: float, after: float, unit: str) -> str:
+    change = (after - before) / before * 100 if before else 0.0
+    return f"{label:<28} {before:>12.2f} {after:>12.2f} {unit:<3} {change:>+7.1f}%"
+
+
+def benchmark(rows: int, repeat: int) -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("❌ The enum benchmark needs PostgreSQL")
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regtype('lead_goal')")).scalar() is None:
+            raise SystemExit("❌ Enum types missing; run alembic upgrade head first")
+
+        print(f"Loading {rows:,} synthetic leads...")
+        setup(conn, rows)
+
+        print(f"\n{'':<28} {'varchar':>12} {'enum':>12}")
+        (text_table, text_index), (enum_table, enum_index) = sizes(conn, "bench_text"), sizes(conn, "bench_enum")
+        print(_row("table size", text_table / 2**20, enum_table / 2**20, "MB"))
+        print(_row("index size", text_index / 2**20, enum_index / 2**20, "MB"))
+
+        for label, sql in QUERIES.items():
+            before = best_time(conn, sql.format(t="bench_text"), repeat)
+            after = best_time(conn, sql.format(t="bench_enum"), repeat)
+            print(_row(label, before * 1000, after * 1000, "ms"))
+
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare varchar and enum lead columns")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query; the best is reported")
+    args = parser.parse_args()
+
+    benchmark(args.rows, args.repeat)
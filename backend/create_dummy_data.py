@@ -1,8 +1,11 @@
-import requests
+import os
 import random
+import sys
 from datetime import datetime, timedelta
 
-API_URL = "http://localhost:8000"
+# Reuse the frontend's pooled API client (keep-alive, retries, shared timeouts)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend'))
+import api_client
 
 # Diverse lead templates
 LEAD_TEMPLATES = [
@@ -112,7 +115,7 @@ def create_lead(template, index):
     }
     
     try:
-        response = requests.post(f"{API_URL}/api/leads", json=data, timeout=30)
+        response = api_client.create_lead(data)
         
         if response.status_code == 201:
             lead = response.json()
@@ -131,6 +134,7 @@ def create_dummy_data(num_leads=50):
     """Create multiple dummy leads"""
     
     print(f"\n🚀 Creating {num_leads} dummy leads...\n")
+    print("   (all from one IP: leave RATE_LIMIT_PER_IP unset or 0 on the API)\n")
     
     successful = 0
     failed = 0
@@ -156,9 +160,8 @@ def create_dummy_data(num_leads=50):
     
     # Show stats
     try:
-        stats_response = requests.get(f"{API_URL}/api/stats")
-        if stats_response.status_code == 200:
-            stats = stats_response.json()
+        stats = api_client.fetch_stats()
+        if stats:
             print(f"\n📊 Database Statistics:")
             print(f"   Total Leads: {stats['total']}")
             print(f"   Hot (70+): {stats['hot']}")
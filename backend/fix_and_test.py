@@ -48,7 +48,7 @@ except Exception as e:
 # Check 4: Test actual qualification
 print("\n4. Testing lead qualification...")
 try:
-    from app.services.groq_ai import qualify_lead
+    from app.services.groq_ai import is_fallback, qualify_lead
 
     result = qualify_lead("I want to invest 20 lakhs for retirement in 10 years")
 
@@ -58,7 +58,7 @@ try:
     print(f"     Budget: {result['budget_range']}")
     print(f"     Score: {result['quality_score']}")
 
-    if result['goal'] == 'unclear' and result['quality_score'] == 30:
+    if is_fallback(result):
         print("\n   ⚠️  WARNING: Got default values - AI might not be analyzing properly")
     else:
         print("\n   ✓ AI is analyzing correctly!")
@@ -67,6 +67,27 @@ except Exception as e:
     print(f"   ❌ Qualification failed: {e}")
     sys.exit(1)
 
+# Check 5: Search and lookup queries still run against the database
+print("\n5. Testing lead search and lookup...")
+try:
+    from app.database import SessionLocal
+    from app import crud
+
+    db = SessionLocal()
+    try:
+        found = crud.search_leads(db, "invest", limit=5)
+        matches = crud.lookup_leads(db, "ravi", limit=5)
+        phone_matches = crud.lookup_leads(db, "98765", limit=5)
+    finally:
+        db.close()
+
+    print(f"   ✓ Search returned {len(found['results'])} leads")
+    print(f"   ✓ Lookup returned {len(matches)} by name, {len(phone_matches)} by phone")
+
+except Exception as e:
+    print(f"   ❌ Search/lookup failed: {e}")
+    sys.exit(1)
+
 print("\n" + "="*60)
-print("✅ All checks passed! Groq AI is working correctly.")
+print("✅ All checks passed! Groq AI, search and lookup are working correctly.")
 print("="*60)
@@ -0,0 +1,40 @@
+"""Rebuild lead_daily_rollups from the leads table.
+
+Run nightly (e.g. from cron) to correct deltas lost between in-process flushes
+or made by bulk SQL outside the API. Days are UTC.
+
+Usage:
+    python reconcile_rollups.py                 # yesterday and today
+    python reconcile_rollups.py --days 30
+    python reconcile_rollups.py --since 2026-01-01 --until 2026-03-31
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from app.database import SessionLocal
+from app import crud
+
+
+def reconcile(since: date, until: date) -> None:
+    db = SessionLocal()
+    start = time.time()
+    try:
+        rows = crud.reconcile_daily_rollups(db, since, until)
+    finally:
+        db.close()
+
+    print(f"✅ Rebuilt {rows} rollup rows for {since} .. {until} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily lead rollups")
+    parser.add_argument("--days", type=int, default=2, help="rebuild this many days up to today")
+    parser.add_argument("--since", type=date.fromisoformat, help="first day (overrides --days)")
+    parser.add_argument("--until", type=date.fromisoformat, help="last day (default today)")
+    args = parser.parse_args()
+
+    until = args.until or datetime.now(timezone.utc).date()
+    since = args.since or until - timedelta(days=args.days - 1)
+    reconcile(since, until)
@@ -0,0 +1,215 @@
+"""Re-qualify historical leads after a prompt, provider or parser change.
+
+Walks ``leads`` in id order, qualifies each chunk concurrently under a rate
+budget and writes the results back with one bulk UPDATE per chunk. Progress is
+checkpointed after every chunk, so the job can be killed and re-run.
+
+Usage:
+    python requalify.py --where "score=30 and goal=unclear"
+    python requalify.py --where "fraud=false" --since 2026-01-01 --until 2026-02-01
+    python requalify.py --where "pending=true"   # leads rule-scored under load
+    python requalify.py --restart           # ignore an existing checkpoint
+"""
+
+import argparse
+import hashlib
+import json
+import operator
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app import crud, models
+from app.services.cache import cache, warn_if_not_shared
+from app.services.groq_ai import is_fallback, qualify_lead
+
+CHECKPOINT_FILE = "requalify_checkpoint.json"
+
+# Filter field name -> (column, value parser)
+FILTER_FIELDS = {
+    "fraud": (models.Lead.is_fraud, lambda v: v.lower() in ("true", "1", "yes")),
+    "score": (models.Lead.quality_score, int),
+    "goal": (models.Lead.goal, str),
+    "timeline": (models.Lead.timeline, str),
+    "budget": (models.Lead.budget_range, str),
+    "status": (models.Lead.status, str),
+    "source": (models.Lead.source, str),
+    "pending": (models.Lead.needs_requalification, lambda v: v.lower() in ("true", "1", "yes")),
+}
+
+OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*(!=|<=|>=|=|<|>)\s*(.+?)\s*$")
+
+
+def parse_where(where: str) -> list:
+    """Turn 'score=30 and goal=unclear' into SQLAlchemy filter clauses."""
+
+    clauses = []
+    if not where:
+        return clauses
+
+    for part in re.split(r"\s+and\s+", where, flags=re.IGNORECASE):
+        match = _CONDITION_RE.match(part)
+        if not match:
+            raise ValueError(f"Cannot parse condition: {part!r}")
+
+        field, op, raw = match.groups()
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unknown field {field!r}, expected one of {', '.join(FILTER_FIELDS)}")
+
+        column, parse = FILTER_FIELDS[field]
+        clauses.append(OPERATORS[op](column, parse(raw)))
+
+    return clauses
+
+
+class RateLimiter:
+    """Token bucket shared by the worker threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def load_checkpoint(job_key: str) -> dict:
+    if os.path.exists(CHECKPOINT_FILE):
+        with open(CHECKPOINT_FILE) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("job_key") == job_key:
+            return checkpoint
+        print("⚠️  Checkpoint belongs to a different filter, starting fresh")
+    return {"job_key": job_key, "last_id": 0, "updated": 0, "failed": 0}
+
+
+def save_checkpoint(checkpoint: dict) -> None:
+    tmp = CHECKPOINT_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+def requalify(where: str, since: str, until: str, chunk_size: int, workers: int,
+              rate: float, restart: bool) -> None:
+    clauses = parse_where(where)
+    if since:
+        clauses.append(models.Lead.created_at >= datetime.fromisoformat(since))
+    if until:
+        clauses.append(models.Lead.created_at < datetime.fromisoformat(until))
+
+    job_key = hashlib.sha1(f"{where}|{since}|{until}".encode()).hexdigest()[:12]
+    checkpoint = {"job_key": job_key, "last_id": 0, "updated": 0, "failed": 0} if restart \
+        else load_checkpoint(job_key)
+
+    if checkpoint["last_id"]:
+        print(f"↻ Resuming after lead id {checkpoint['last_id']}")
+
+    limiter = RateLimiter(rate)
+
+    def qualify(row):
+        limiter.wait()
+        return row.id, qualify_lead(row.initial_message)
+
+    db = SessionLocal()
+    start = time.time()
+    processed = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                rows = db.query(models.Lead.id, models.Lead.initial_message).filter(
+                    models.Lead.id > checkpoint["last_id"], *clauses
+                ).order_by(models.Lead.id).limit(chunk_size).all()
+
+                if not rows:
+                    break
+
+                updates = []
+                for lead_id, result in pool.map(qualify, rows):
+                    if is_fallback(result):
+                        checkpoint["failed"] += 1
+                        continue
+                    updates.append({
+                        "id": lead_id,
+                        "goal": result.get("goal"),
+                        "timeline": result.get("timeline"),
+                        "budget_range": result.get("budget_range"),
+                        "clarity": result.get("clarity"),
+                        "completeness": result.get("completeness"),
+                        "quality_score": result.get("quality_score"),
+                        "score_version": result.get("score_version"),
+                        "needs_requalification": False,
+                    })
+
+                # ORM bulk UPDATE by primary key: one executemany per chunk
+                if updates:
+                    db.execute(update(models.Lead), updates)
+                db.commit()
+                if updates:
+                    # Cached lead details and dashboard stats still hold the old scores
+                    cache.invalidate('lead')
+                    cache.invalidate('stats')
+
+                processed += len(rows)
+                checkpoint["last_id"] = rows[-1].id
+                checkpoint["updated"] += len(updates)
+                save_checkpoint(checkpoint)
+
+                elapsed = time.time() - start
+                print(f"   up to id {checkpoint['last_id']}: {processed} processed, "
+                      f"{processed / elapsed:.1f} leads/s")
+
+        # Scores moved between hot/warm/cold; rebuild the affected days' rollups
+        if checkpoint["updated"]:
+            first_day = datetime.fromisoformat(since).date() if since else date.min
+            last_day = datetime.fromisoformat(until).date() if until else datetime.now(timezone.utc).date()
+            crud.reconcile_daily_rollups(db, first_day, last_day)
+            warn_if_not_shared()
+    finally:
+        db.close()
+
+    elapsed = time.time() - start
+    print("\n" + "=" * 50)
+    print(f"✅ Updated: {checkpoint['updated']} leads")
+    print(f"❌ Failed:  {checkpoint['failed']} leads (kept old values)")
+    if processed:
+        print(f"⏱  {processed} leads in {elapsed:.1f}s ({processed / elapsed:.1f} leads/s)")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-qualify historical leads")
+    parser.add_argument("--where", default="", help='e.g. "score=30 and goal=unclear"')
+    parser.add_argument("--since", help="created_at >= this ISO date")
+    parser.add_argument("--until", help="created_at < this ISO date")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="max LLM calls per second (0 = unlimited)")
+    parser.add_argument("--restart", action="store_true", help="ignore the existing checkpoint")
+    args = parser.parse_args()
+
+    requalify(args.where, args.since, args.until, args.chunk_size, args.workers, args.rate, args.restart)
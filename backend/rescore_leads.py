@@ -0,0 +1,58 @@
+"""Re-score stored leads after a change to the scoring weight table.
+
+Scores are recomputed from each lead's stored features (budget_range,
+timeline, clarity, completeness) in one set-based UPDATE, with no LLM calls.
+Leads already scored with the target version are left alone, so re-running is
+cheap. Daily rollups are rebuilt afterwards since hot/warm/cold counts move.
+
+Usage:
+    python rescore_leads.py                 # current SCORE_WEIGHTS_VERSION
+    python rescore_leads.py --version 2
+    python rescore_leads.py --dry-run       # count leads that would change
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timezone
+
+from sqlalchemy import func, or_
+
+from app.database import SessionLocal
+from app import crud, models
+from app.services import scoring
+from app.services.cache import warn_if_not_shared
+
+
+def rescore(version: int, dry_run: bool) -> None:
+    if version not in scoring.WEIGHTS:
+        raise SystemExit(f"❌ Unknown weight table version {version} (have {sorted(scoring.WEIGHTS)})")
+
+    db = SessionLocal()
+    try:
+        lead = models.Lead
+        pending = db.query(func.count(lead.id)).filter(
+            or_(lead.score_version.is_(None), lead.score_version != version)
+        ).scalar()
+        print(f"{pending} leads not on weight table v{version}")
+        if dry_run or not pending:
+            return
+
+        start = time.time()
+        updated = crud.rescore_leads(db, version)
+        elapsed = time.time() - start
+        print(f"✅ Re-scored {updated} leads in {elapsed:.2f}s")
+        warn_if_not_shared()
+
+        crud.reconcile_daily_rollups(db, date.min, datetime.now(timezone.utc).date())
+        print("✅ Daily rollups rebuilt")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score leads from stored features")
+    parser.add_argument("--version", type=int, default=scoring.SCORE_VERSION, help="weight table version")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    rescore(args.version, args.dry_run)
@@ -0,0 +1,80 @@
+"""Train the local lead classifier on LLM labels already stored in the database.
+
+Usage: python train_classifier.py [output_dir]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from app.database import SessionLocal
+from app import models
+from app.services import local_classifier
+
+
+def load_training_rows(db):
+    """Qualified, non-fraud leads labelled by the LLM.
+
+    Leads whose LLM call failed or was shed are stored with rule-based labels and
+    needs_requalification set; they are skipped until requalify.py relabels them.
+    Genuinely vague leads (unclear/unclear/not_disclosed) stay in: the model has
+    to learn that class too.
+    """
+
+    return db.query(
+        models.Lead.initial_message,
+        models.Lead.goal,
+        models.Lead.timeline,
+        models.Lead.budget_range,
+        models.Lead.quality_score,
+    ).filter(
+        models.Lead.is_fraud == False,
+        models.Lead.needs_requalification.isnot(True),
+        models.Lead.goal.isnot(None),
+        models.Lead.timeline.isnot(None),
+        models.Lead.budget_range.isnot(None),
+        models.Lead.quality_score.isnot(None),
+    ).all()
+
+
+def train(output_dir: str) -> None:
+    db = SessionLocal()
+    try:
+        rows = load_training_rows(db)
+    finally:
+        db.close()
+
+    if len(rows) < 50:
+        print(f"❌ Only {len(rows)} labeled leads, need at least 50 to train")
+        sys.exit(1)
+
+    print(f"🚀 Training on {len(rows)} labeled leads...")
+    start = time.time()
+
+    matrix = local_classifier.build_matrix([r.initial_message for r in rows])
+
+    weights = {}
+    labels = {}
+    for field in local_classifier.CATEGORICAL_FIELDS:
+        values = [getattr(r, field) for r in rows]
+        labels[field] = sorted(set(values))
+        index = {label: i for i, label in enumerate(labels[field])}
+        y = np.array([index[v] for v in values], dtype=np.int64)
+        weights[field] = local_classifier.fit_softmax(matrix, y, len(labels[field]))
+
+        # Training-set accuracy as a quick sanity check
+        pred = local_classifier._sparse_dot(*matrix, weights[field]).argmax(axis=1)
+        print(f"   {field}: {len(labels[field])} classes, train accuracy {(pred == y).mean():.1%}")
+
+    scores = np.array([r.quality_score for r in rows])
+    weights[local_classifier.SCORE_FIELD] = local_classifier.fit_regression(matrix, scores)
+    pred = local_classifier._sparse_dot(*matrix, weights[local_classifier.SCORE_FIELD])[:, 0] * 100
+    print(f"   quality_score: train MAE {np.abs(pred - scores).mean():.1f}")
+
+    local_classifier.save_model(output_dir, weights, labels, len(rows))
+    print(f"✅ Model saved to {output_dir} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    train(sys.argv[1] if len(sys.argv) > 1 else local_classifier.MODEL_PATH)
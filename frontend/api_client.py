@@ -0,0 +1,271 @@
+"""Shared client for the Lead Qualification API.
+
+One pooled connection adapter (keep-alive, retries on idempotent calls) is
+shared across Streamlit reruns and users; each user gets their own
+``requests.Session`` on top of it, so API cookies are never shared between
+users. Read endpoints are cached with per-endpoint TTLs. Call ``invalidate()``
+after any write so the next rerun sees fresh data.
+
+Works outside Streamlit too (e.g. ``backend/create_dummy_data.py``), in which
+case reads are simply not cached.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+API_URL = os.getenv('API_URL', 'http://localhost:8000')
+
+DEFAULT_TIMEOUT = 10
+CREATE_LEAD_TIMEOUT = 30
+
+# Seconds each read endpoint may be served from cache
+STATS_TTL = 10
+LEADS_TTL = 15
+ROLLUP_TTL = 60
+
+
+def _cache_resource(func):
+    return st.cache_resource(func) if st else functools.lru_cache(maxsize=None)(func)
+
+
+def _cache_data(ttl):
+    def decorator(func):
+        return st.cache_data(ttl=ttl, show_spinner=False)(func) if st else func
+    return decorator
+
+
+@_cache_resource
+def get_adapter() -> HTTPAdapter:
+    """Connection pool shared by every session; retries connection errors and 502/503/504 on GET/HEAD only."""
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+    )
+    return HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", get_adapter())
+    session.mount("https://", get_adapter())
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _script_session() -> requests.Session:
+    return _new_session()
+
+
+def get_session() -> requests.Session:
+    """The current Streamlit user's session (one shared session outside Streamlit).
+
+    Cookies are per user, so the API's recent_write cookie, which keeps reads on
+    the primary database right after a write, only follows the user who wrote.
+    """
+
+    if st is None or not st.runtime.exists():
+        return _script_session()
+    if "api_session" not in st.session_state:
+        st.session_state.api_session = _new_session()
+    return st.session_state.api_session
+
+
+def _get_json(path: str, params: dict = None, timeout: float = DEFAULT_TIMEOUT):
+    response = get_session().get(f"{API_URL}{path}", params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+@_cache_data(ttl=STATS_TTL)
+def fetch_stats() -> dict:
+    return _get_json("/api/stats")
+
+
+@_cache_data(ttl=LEADS_TTL)
+def fetch_leads(params: dict) -> list:
+    return _get_json("/api/leads", params=params)
+
+
+@_cache_data(ttl=LEADS_TTL)
+def fetch_dashboard(params: dict, q: str = "", cursor: str = None) -> dict:
+    """Stats plus one page of leads in a single request."""
+
+    if q:
+        params = {"limit": params.get("limit", 100), "q": q}
+    if cursor:
+        params = {**params, "cursor": cursor}
+    return _get_json("/api/dashboard", params=params)
+
+
+@_cache_data(ttl=ROLLUP_TTL)
+def fetch_daily(start: str = None, group_by: str = None) -> list:
+    """Per-day lead counts from the rollup table (default: the last year)"""
+
+    params = {}
+    if start:
+        params["start"] = start
+    if group_by:
+        params["group_by"] = group_by
+    return _get_json("/api/analytics/daily", params=params)
+
+
+def fetch_changes(since: str = None, limit: int = 500) -> dict:
+    """Leads changed since a token (uncached; callers keep their own state)."""
+
+    params = {"limit": limit}
+    if since:
+        params["since"] = since
+    return _get_json("/api/leads/changes", params=params)
+
+
+def invalidate() -> None:
+    """Drop every cached read; call after a successful write."""
+
+    if st:
+        for func in (fetch_stats, fetch_leads, fetch_dashboard, fetch_daily):
+            func.clear()
+
+
+def _peer_address():
+    """Address of whoever opened this user's Streamlit connection (browser or proxy)."""
+
+    from streamlit.runtime import get_instance
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    client = get_instance().get_client(ctx.session_id) if ctx else None
+    return client.request.remote_ip if client else None
+
+
+def _forwarded_for() -> dict:
+    """X-Forwarded-For for a request made on behalf of the current Streamlit user.
+
+    Lead POSTs come from this server, so without it the API's per-IP rate limit
+    would see one IP for every user. Like any proxy, we append the address we
+    saw the user connect from to the chain we received, never pass it on as is.
+    """
+
+    if not st:
+        return {}
+    try:
+        peer = _peer_address()
+        received = st.context.headers.get("X-Forwarded-For")
+    except Exception:
+        # Outside a script run there is no browser connection to read
+        return {}
+    if not peer:
+        return {}
+    return {"X-Forwarded-For": f"{received}, {peer}" if received else peer}
+
+
+def create_lead(payload: dict, timeout: float = CREATE_LEAD_TIMEOUT,
+                idempotency_key: str = None) -> requests.Response:
+    """POST a lead. Pass the same ``idempotency_key`` when resending one submission
+    so the API replays the first result instead of creating a duplicate."""
+
+    headers = {"Idempotency-Key": idempotency_key or str(uuid.uuid4()), **_forwarded_for()}
+    response = get_session().post(f"{API_URL}/api/leads", json=payload, headers=headers, timeout=timeout)
+    if response.ok:
+        invalidate()
+    return response
+
+
+def update_lead(lead_id: int, payload: dict) -> requests.Response:
+    response = get_session().patch(f"{API_URL}/api/leads/{lead_id}", json=payload, timeout=DEFAULT_TIMEOUT)
+    if response.ok:
+        invalidate()
+    return response
+
+
+def bulk_update_leads(payload: dict) -> requests.Response:
+    response = get_session().patch(f"{API_URL}/api/leads", json=payload, timeout=DEFAULT_TIMEOUT)
+    if response.ok:
+        invalidate()
+    return response
+
+
+def health_check() -> requests.Response:
+    return get_session().get(f"{API_URL}/", timeout=5)
+
+
+class LiveEvents:
+    """Background SSE reader for /api/events shared by every Streamlit session.
+
+    Events are numbered locally on receipt, so sessions can ask for everything
+    after the last number they saw even across backend restarts. A ``resync``
+    event is emitted after every reconnect, since events may have been missed;
+    cached reads are cleared then too, once for the whole process.
+    """
+
+    def __init__(self, maxlen: int = 500):
+        self.events = deque(maxlen=maxlen)
+        self.seq = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self._run, name="live-events", daemon=True).start()
+
+    def _append(self, event_type: str, data: dict) -> None:
+        with self.lock:
+            self.seq += 1
+            self.events.append((self.seq, event_type, data))
+
+    def _run(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                # Read timeout comfortably above the server's 15s keepalive
+                with requests.get(f"{API_URL}/api/events", stream=True, timeout=(5, 60)) as response:
+                    response.raise_for_status()
+                    backoff = 1
+                    invalidate()
+                    self._append("resync", {})
+
+                    event_type, data = "message", ""
+                    for line in response.iter_lines(decode_unicode=True):
+                        if line.startswith("event:"):
+                            event_type = line[6:].strip()
+                        elif line.startswith("data:"):
+                            data += line[5:].strip()
+                        elif line == "":
+                            if data:
+                                self._append(event_type, json.loads(data))
+                            event_type, data = "message", ""
+            except (requests.RequestException, ValueError):
+                pass
+
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def last_seq(self) -> int:
+        with self.lock:
+            return self.seq
+
+    def since(self, seq: int) -> list:
+        """Events numbered after ``seq``, oldest first."""
+
+        with self.lock:
+            return [event for event in self.events if event[0] > seq]
+
+
+@_cache_resource
+def get_live_events() -> LiveEvents:
+    return LiveEvents()
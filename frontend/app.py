@@ -6,16 +6,29 @@ import traceback
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import re
+import uuid
 from dotenv import load_dotenv
 
+import api_client
+
 load_dotenv()
 
 # Get API URL from environment or Streamlit secrets
 API_URL = os.getenv('API_URL') or st.secrets.get('API_URL', 'http://localhost:8000')
 
+def submission_key(payload: dict) -> str:
+    """Idempotency key for a form submission; resending the same details reuses it."""
+    last = st.session_state.get('lead_submission')
+    if last and last['payload'] == payload:
+        return last['key']
+    key = str(uuid.uuid4())
+    st.session_state['lead_submission'] = {'payload': payload, 'key': key}
+    return key
+
+
 def validate_lead_form(name: str, email: str, phone: str, message: str) -> list[str]:
     """Validate form fields and return list of error messages. Empty list = all valid."""
     errors = []
@@ -52,7 +65,81 @@ def validate_lead_form(name: str, email: str, phone: str, message: str) -> list[
     
     return errors
 
-API_URL = os.getenv('API_URL', 'http://localhost:8000')
+API_URL = api_client.API_URL
+
+
+def sync_leads_frame() -> pd.DataFrame:
+    """All leads as a DataFrame kept in session state; each call merges only the changes since the last one."""
+    
+    frame = st.session_state.get('leads_frame')
+    token = st.session_state.get('leads_frame_token')
+    
+    while True:
+        delta = api_client.fetch_changes(token)
+        changed = pd.DataFrame(delta['changes'])
+        
+        if frame is None or frame.empty:
+            # An empty frame may have no columns (e.g. first sync with no leads)
+            frame = changed
+        elif not changed.empty:
+            # Upsert by id: changed rows replace their old versions
+            frame = pd.concat([frame[~frame['id'].isin(changed['id'])], changed], ignore_index=True)
+        
+        if delta['deleted_ids'] and not frame.empty:
+            frame = frame[~frame['id'].isin(delta['deleted_ids'])]
+        
+        token = delta['next_token']
+        if not delta['has_more']:
+            break
+    
+    st.session_state.leads_frame = frame
+    st.session_state.leads_frame_token = token
+    return frame
+
+@st.fragment(run_every=3)
+def live_dashboard(base_stats: dict):
+    """Metrics plus a table of leads created/updated since the last full render, patched from pushed events."""
+    
+    listener = api_client.get_live_events()
+    new_events = listener.since(st.session_state.live_seq)
+    if new_events:
+        # Cached reads are left alone: this fragment renders the events itself, the
+        # caches expire on their own TTLs, and the reader clears them after a reconnect
+        st.session_state.live_seq = new_events[-1][0]
+    
+    for _, event_type, data in new_events:
+        if event_type == 'resync':
+            # Events may have been missed; re-render from fresh data
+            st.rerun(scope="app")
+        elif event_type == 'stats_delta':
+            for key, value in data.items():
+                st.session_state.live_delta[key] = st.session_state.live_delta.get(key, 0) + value
+        elif event_type in ('lead_created', 'lead_updated'):
+            st.session_state.live_leads[data['id']] = data
+            if event_type == 'lead_created' and (data.get('quality_score') or 0) >= 70:
+                st.toast(f"🔥 New hot lead: {data['name']} ({data['quality_score']})")
+    
+    delta = st.session_state.live_delta
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    col1.metric("Total Leads", base_stats.get('total', 0) + delta.get('total', 0), delta.get('total') or None)
+    col2.metric("🔥 Hot", base_stats.get('hot', 0) + delta.get('hot', 0), delta.get('hot') or None)
+    col3.metric("⚠️ Warm", base_stats.get('warm', 0) + delta.get('warm', 0), delta.get('warm') or None)
+    col4.metric("❄️ Cold", base_stats.get('cold', 0) + delta.get('cold', 0), delta.get('cold') or None)
+    col5.metric("⚡ Fraud", base_stats.get('fraud', 0) + delta.get('fraud', 0), delta.get('fraud') or None)
+    
+    if st.session_state.live_leads:
+        st.caption(f"🔔 {len(st.session_state.live_leads)} leads created or updated since this page loaded")
+        live_df = pd.DataFrame(list(st.session_state.live_leads.values()))
+        st.dataframe(
+            live_df[['id', 'name', 'goal', 'quality_score', 'status', 'created_at']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'quality_score': st.column_config.ProgressColumn('Score', min_value=0, max_value=100, format="%d"),
+            }
+        )
+
 
 # Page config
 st.set_page_config(
@@ -160,17 +247,14 @@ if page == "Lead Capture Form":
                     try:
                         # Call API
                         lead_api_url = f"{API_URL}/api/leads"
-                        response = requests.post(
-                            lead_api_url,
-                            json={
-                                "name": name,
-                                "email": email,
-                                "phone": phone,
-                                "initial_message": message,
-                                "source": source.lower()
-                            },
-                            timeout=30
-                        )
+                        payload = {
+                            "name": name,
+                            "email": email,
+                            "phone": phone,
+                            "initial_message": message,
+                            "source": source.lower()
+                        }
+                        response = api_client.create_lead(payload, idempotency_key=submission_key(payload))
                         
                         if response.status_code == 201:
                             lead_data = response.json()
@@ -218,19 +302,9 @@ if page == "Lead Capture Form":
 elif page == "Dashboard":
     st.markdown('<div class="main-header">Lead Dashboard</div>', unsafe_allow_html=True)
     
-    # Fetch stats
     try:
-        stats_response = requests.get(f"{API_URL}/api/stats", timeout=10)
-        stats = stats_response.json() if stats_response.status_code == 200 else {}
-        
-        # Summary metrics
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        col1.metric("Total Leads", stats.get('total', 0))
-        col2.metric("🔥 Hot", stats.get('hot', 0))
-        col3.metric("⚠️ Warm", stats.get('warm', 0))
-        col4.metric("❄️ Cold", stats.get('cold', 0))
-        col5.metric("⚡ Fraud", stats.get('fraud', 0))
+        # Summary metrics (filled in below, once the dashboard response arrives)
+        metrics = st.container()
         
         st.markdown("---")
         
@@ -243,7 +317,7 @@ elif page == "Dashboard":
         with col2:
             status_filter = st.selectbox("Status", ["All", "new", "assigned", "contacted", "closed"])
         with col3:
-            limit = st.number_input("Results Limit", min_value=10, max_value=1000, value=100, step=10)
+            limit = st.selectbox("Page Size", [25, 50, 100, 200], index=2)
         
         # Build query params
         params = {"limit": limit}
@@ -258,95 +332,147 @@ elif page == "Dashboard":
         if status_filter != "All":
             params["status"] = status_filter
         
-        # Fetch leads
-        leads_response = requests.get(f"{API_URL}/api/leads", params=params, timeout=10)
+        search_query = st.text_input("🔍 Search leads", placeholder='e.g. NRI, 80C, rajesh@example.com')
+        
+        # Pagination: keep only the cursors of visited pages, reset when filters change
+        filter_key = (score_filter, status_filter, limit, search_query)
+        if st.session_state.get('dashboard_filter_key') != filter_key:
+            st.session_state.dashboard_filter_key = filter_key
+            st.session_state.dashboard_cursors = [None]
+        page_cursors = st.session_state.dashboard_cursors
         
-        if leads_response.status_code == 200:
-            leads = leads_response.json()
+        # Stats and one page of leads in one round-trip (full-text search ignores the filters above)
+        dashboard = api_client.fetch_dashboard(params, search_query, page_cursors[-1])
+        stats, leads = dashboard['stats'], dashboard['leads']
+        
+        # Live updates start from this full render
+        st.session_state.live_seq = api_client.get_live_events().last_seq()
+        st.session_state.live_delta = {}
+        st.session_state.live_leads = {}
+        
+        with metrics:
+            live_dashboard(stats)
+        
+        if not leads:
+            st.info("No leads found matching your filters.")
+        else:
+            # Convert to DataFrame
+            df = pd.DataFrame(leads)
             
-            if not leads:
-                st.info("No leads found matching your filters.")
-            else:
-                # Convert to DataFrame
-                df = pd.DataFrame(leads)
-                
-                # Display count
-                st.subheader(f"Leads ({len(df)})")
-                
-                # Style the dataframe
-                def highlight_score(val):
-                    if pd.isna(val):
-                        return ''
-                    if val >= 70:
-                        return 'background-color: #d1fae5'
-                    elif val >= 40:
-                        return 'background-color: #fef3c7'
-                    else:
-                        return 'background-color: #fee2e2'
-                
-                # Select columns to display
-                display_columns = ['id', 'name', 'email', 'phone', 'goal', 'timeline', 'budget_range', 'quality_score', 'status', 'created_at']
-                display_df = df[display_columns].copy()
-                
-                # Rename for better readability
-                display_df.columns = ['ID', 'Name', 'Email', 'Phone', 'Goal', 'Timeline', 'Budget', 'Score', 'Status', 'Created']
+            # Display count
+            st.subheader(f"Leads (page {len(page_cursors)}, {len(df)} rows)")
+            
+            # Select columns to display
+            display_columns = ['id', 'name', 'email', 'phone', 'goal', 'timeline', 'budget_range', 'quality_score', 'status', 'created_at']
+            display_df = df[display_columns].copy()
+            
+            # Rename for better readability
+            display_df.columns = ['ID', 'Name', 'Email', 'Phone', 'Goal', 'Timeline', 'Budget', 'Score', 'Status', 'Created']
+            
+            # Score tier computed for the whole column at once (no per-cell styling callback)
+            display_df.insert(7, 'Tier', pd.cut(
+                display_df['Score'],
+                bins=[-float('inf'), 40, 70, float('inf')],
+                right=False,
+                labels=['❄️ Cold', '⚠️ Warm', '🔥 Hot']
+            ))
+            
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                height=400,
+                hide_index=True,
+                column_config={
+                    'Score': st.column_config.ProgressColumn('Score', min_value=0, max_value=100, format="%d"),
+                }
+            )
+            
+            # Page navigation
+            col1, col2, _ = st.columns([1, 1, 6])
+            with col1:
+                if st.button("⬅️ Previous", disabled=len(page_cursors) == 1):
+                    page_cursors.pop()
+                    st.rerun()
+            with col2:
+                if st.button("Next ➡️", disabled=not dashboard['next_cursor']):
+                    page_cursors.append(dashboard['next_cursor'])
+                    st.rerun()
+            
+            # Download CSV
+            csv = df.to_csv(index=False)
+            st.download_button(
+                label="📥 Download page as CSV",
+                data=csv,
+                file_name=f"leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # Lead details expander
+            st.subheader("Lead Details")
+            selected_id = st.selectbox("Select Lead ID to view details:", df['id'].tolist())
+            
+            if selected_id:
+                # Already loaded with the page, no extra request
+                lead_detail = next(lead for lead in leads if lead['id'] == selected_id)
                 
-                # Apply styling
-                styled_df = display_df.style.applymap(highlight_score, subset=['Score'])
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write("**Contact Information:**")
+                    st.write(f"Name: {lead_detail['name']}")
+                    st.write(f"Email: {lead_detail['email']}")
+                    st.write(f"Phone: {lead_detail['phone']}")
                 
-                st.dataframe(styled_df, use_container_width=True, height=400)
+                with col2:
+                    st.write("**Qualification:**")
+                    st.write(f"Score: {lead_detail.get('quality_score', 'N/A')}/100")
+                    st.write(f"Goal: {lead_detail.get('goal', 'N/A')}")
+                    st.write(f"Timeline: {lead_detail.get('timeline', 'N/A')}")
+                    st.write(f"Budget: {lead_detail.get('budget_range', 'N/A')}")
                 
-                # Download CSV
-                csv = df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                st.write("**Initial Message:**")
+                st.info(lead_detail['initial_message'])
                 
-                # Lead details expander
-                st.subheader("Lead Details")
-                selected_id = st.selectbox("Select Lead ID to view details:", df['id'].tolist())
+                # Update status
+                st.write("**Update Lead:**")
+                new_status = st.selectbox("Change Status:", ["new", "assigned", "contacted", "meeting_booked", "closed", "lost"])
+                assigned_to = st.text_input("Assign To (name/email):")
                 
-                if selected_id:
-                    lead_detail = requests.get(f"{API_URL}/api/leads/{selected_id}", timeout=10).json()
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write("**Contact Information:**")
-                        st.write(f"Name: {lead_detail['name']}")
-                        st.write(f"Email: {lead_detail['email']}")
-                        st.write(f"Phone: {lead_detail['phone']}")
-                    
-                    with col2:
-                        st.write("**Qualification:**")
-                        st.write(f"Score: {lead_detail.get('quality_score', 'N/A')}/100")
-                        st.write(f"Goal: {lead_detail.get('goal', 'N/A')}")
-                        st.write(f"Timeline: {lead_detail.get('timeline', 'N/A')}")
-                        st.write(f"Budget: {lead_detail.get('budget_range', 'N/A')}")
-                    
-                    st.write("**Initial Message:**")
-                    st.info(lead_detail['initial_message'])
-                    
-                    # Update status
-                    st.write("**Update Lead:**")
-                    new_status = st.selectbox("Change Status:", ["new", "assigned", "contacted", "meeting_booked", "closed", "lost"])
-                    assigned_to = st.text_input("Assign To (name/email):")
+                if st.button("Update Lead"):
+                    update_response = api_client.update_lead(
+                        selected_id,
+                        {"status": new_status, "assigned_to": assigned_to if assigned_to else None}
+                    )
                     
-                    if st.button("Update Lead"):
-                        update_response = requests.patch(
-                            f"{API_URL}/api/leads/{selected_id}",
-                            json={"status": new_status, "assigned_to": assigned_to if assigned_to else None},
-                            timeout=10
-                        )
-                        
-                        if update_response.status_code == 200:
-                            st.success("✅ Lead updated successfully!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to update lead")
-        
+                    if update_response.status_code == 200:
+                        st.success("✅ Lead updated successfully!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to update lead")
+
+            # Bulk update (one request, one UPDATE statement on the backend)
+            st.subheader("Bulk Update")
+            bulk_ids = st.multiselect("Select Lead IDs:", df['id'].tolist())
+            col1, col2 = st.columns(2)
+            with col1:
+                bulk_status = st.selectbox("Set Status:", ["(unchanged)", "new", "assigned", "contacted", "meeting_booked", "closed", "lost"])
+            with col2:
+                bulk_assigned_to = st.text_input("Assign Selected To (name/email):")
+
+            if st.button("Update Selected Leads", disabled=not bulk_ids):
+                payload = {"ids": bulk_ids}
+                if bulk_status != "(unchanged)":
+                    payload["status"] = bulk_status
+                if bulk_assigned_to:
+                    payload["assigned_to"] = bulk_assigned_to
+
+                bulk_response = api_client.bulk_update_leads(payload)
+
+                if bulk_response.status_code == 200:
+                    st.success(f"✅ Updated {len(bulk_response.json())} leads")
+                    st.rerun()
+                else:
+                    st.error(f"❌ Bulk update failed: {bulk_response.json().get('detail', bulk_response.status_code)}")
+
     except requests.exceptions.ConnectionError:
         st.error("⚠️ Cannot connect to backend. Make sure FastAPI is running on http://localhost:8000")
     except Exception as e:
@@ -359,52 +485,58 @@ elif page == "Analytics":
     st.markdown('<div class="main-header">Analytics</div>', unsafe_allow_html=True)
     
     try:
-        # Fetch all leads
-        leads_response = requests.get(f"{API_URL}/api/leads", params={"limit": 1000}, timeout=10)
-        
-        if leads_response.status_code == 200:
-            leads = leads_response.json()
+        # All leads, refreshed incrementally from the change feed
+        df = sync_leads_frame().copy()
+        
+        if df.empty:
+            st.info("No data available for analytics yet.")
+        else:
+            # Score distribution
+            st.subheader("Score Distribution")
+            fig_hist = px.histogram(df, x='quality_score', nbins=20, 
+                                   title='Lead Quality Score Distribution',
+                                   labels={'quality_score': 'Quality Score'},
+                                   color_discrete_sequence=['#2563eb'])
+            st.plotly_chart(fig_hist, use_container_width=True)
+            
+            # Goal breakdown
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Goals Distribution")
+                goal_counts = df['goal'].value_counts()
+                fig_pie = px.pie(values=goal_counts.values, names=goal_counts.index,
+                                title='Lead Goals')
+                st.plotly_chart(fig_pie, use_container_width=True)
+            
+            with col2:
+                st.subheader("Timeline Distribution")
+                timeline_counts = df['timeline'].value_counts()
+                fig_bar = px.bar(x=timeline_counts.index, y=timeline_counts.values,
+                                title='Lead Timelines',
+                                labels={'x': 'Timeline', 'y': 'Count'})
+                st.plotly_chart(fig_bar, use_container_width=True)
             
-            if not leads:
-                st.info("No data available for analytics yet.")
+            # Leads over time, from the server-side daily rollups
+            st.subheader("Leads Over Time")
+            col1, col2 = st.columns(2)
+            with col1:
+                period_days = st.selectbox("Period", [30, 90, 365, 1095], index=2,
+                                           format_func=lambda d: f"Last {d} days")
+            with col2:
+                split_by = st.selectbox("Split by", ["None", "source", "goal", "status_bucket"])
+            
+            start = (datetime.utcnow().date() - timedelta(days=period_days - 1)).isoformat()
+            daily_leads = pd.DataFrame(api_client.fetch_daily(start, None if split_by == "None" else split_by))
+            if daily_leads.empty:
+                st.info("No leads in this period.")
             else:
-                df = pd.DataFrame(leads)
-                
-                # Score distribution
-                st.subheader("Score Distribution")
-                fig_hist = px.histogram(df, x='quality_score', nbins=20, 
-                                       title='Lead Quality Score Distribution',
-                                       labels={'quality_score': 'Quality Score'},
-                                       color_discrete_sequence=['#2563eb'])
-                st.plotly_chart(fig_hist, use_container_width=True)
-                
-                # Goal breakdown
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("Goals Distribution")
-                    goal_counts = df['goal'].value_counts()
-                    fig_pie = px.pie(values=goal_counts.values, names=goal_counts.index,
-                                    title='Lead Goals')
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                
-                with col2:
-                    st.subheader("Timeline Distribution")
-                    timeline_counts = df['timeline'].value_counts()
-                    fig_bar = px.bar(x=timeline_counts.index, y=timeline_counts.values,
-                                    title='Lead Timelines',
-                                    labels={'x': 'Timeline', 'y': 'Count'})
-                    st.plotly_chart(fig_bar, use_container_width=True)
-                
-                # Leads over time
-                st.subheader("Leads Over Time")
-                df['created_date'] = pd.to_datetime(df['created_at']).dt.date
-                daily_leads = df.groupby('created_date').size().reset_index(name='count')
-                fig_line = px.line(daily_leads, x='created_date', y='count',
+                fig_line = px.line(daily_leads, x='day', y='leads',
+                                  color=None if split_by == "None" else 'group',
                                   title='Daily Lead Volume',
-                                  labels={'created_date': 'Date', 'count': 'Number of Leads'})
+                                  labels={'day': 'Date', 'leads': 'Number of Leads', 'group': split_by})
                 st.plotly_chart(fig_line, use_container_width=True)
-                
+            
     except Exception as e:
         st.error(f"❌ Error loading analytics: {str(e)}")
 
@@ -706,17 +838,13 @@ print(f"Warm Leads: {{stats['warm']}}")
         if st.form_submit_button("Test API"):
             with st.spinner("Calling API..."):
                 try:
-                    response = requests.post(
-                        f"{API_URL}/api/leads",
-                        json={
-                            "name": test_name,
-                            "email": test_email,
-                            "phone": test_phone,
-                            "initial_message": test_message,
-                            "source": "api_test"
-                        },
-                        timeout=10
-                    )
+                    response = api_client.create_lead({
+                        "name": test_name,
+                        "email": test_email,
+                        "phone": test_phone,
+                        "initial_message": test_message,
+                        "source": "api_test"
+                    }, timeout=10)
                     
                     st.write("**Response Status:**", response.status_code)
                     st.write("**Response Body:**")
@@ -768,7 +896,7 @@ print(f"Warm Leads: {{stats['warm']}}")
     
     if st.button("Check API Status"):
         try:
-            response = requests.get(f"{API_URL}/", timeout=5)
+            response = api_client.health_check()
             if response.status_code == 200:
                 st.success("✅ API is healthy and running!")
                 st.json(response.json())